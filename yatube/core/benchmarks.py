@@ -0,0 +1,56 @@
+"""Общие помощники для команд-бенчмарков."""
+import contextlib
+import statistics
+import time
+
+from django.db import connection
+
+
+@contextlib.contextmanager
+def temporary_database(path=None):
+    """Создаёт чистую тестовую базу на время замера и удаляет её после.
+
+    По умолчанию база SQLite живёт в памяти; `path` задаёт файл, если
+    замеру важна работа с диском и блокировки между соединениями.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if path:
+        test_settings['NAME'] = path
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+
+
+def measure(func, repeat=5):
+    """Возвращает медиану времени выполнения `func` в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def seed_posts(total, author, group=None, batch_size=1000, text=None):
+    """Быстро создаёт `total` постов пачками через `bulk_create`.
+
+    `text` - необязательная функция, строящая текст поста по номеру.
+    """
+    from posts.models import Post
+
+    batch = []
+    for i in range(total):
+        batch.append(Post(
+            text=text(i) if text else f'Пост для замера {i}',
+            author=author,
+            group=group))
+        if len(batch) == batch_size:
+            Post.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Post.objects.bulk_create(batch)
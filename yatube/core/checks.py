@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.checks import Error, Warning, register
+
+
+@register()
+def check_password_hash_policy(app_configs, **kwargs):
+    policy = settings.PASSWORD_HASH_POLICY
+    errors = []
+    preferred = get_hashers()[0]
+    library = getattr(preferred, 'library', None)
+    if library:
+        try:
+            preferred._load_library()
+        except ValueError as error:
+            errors.append(Error(
+                f'Политика {policy!r} недоступна: {error}',
+                hint='Установите пакет алгоритма или смените политику.',
+                id='core.E001'))
+    if policy == 'fast':
+        errors.append(Warning(
+            'PASSWORD_HASH_POLICY "fast" годится только для тестов.',
+            id='core.W001'))
+    return errors
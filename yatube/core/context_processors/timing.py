@@ -0,0 +1,31 @@
+import functools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TIMINGS_ATTR = 'context_processor_timings'
+
+
+def timed(processor):
+    """Оборачивает context processor замером времени.
+
+    Время в секундах копится в словаре `request.context_processor_timings`
+    по полному имени процессора и пишется в лог на уровне DEBUG.
+    """
+    name = f'{processor.__module__}.{processor.__qualname__}'
+
+    @functools.wraps(processor)
+    def wrapper(request):
+        start = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            timings = getattr(request, TIMINGS_ATTR, None)
+            if timings is None:
+                timings = {}
+                setattr(request, TIMINGS_ATTR, timings)
+            timings[name] = timings.get(name, 0) + elapsed
+            logger.debug('%s: %.3f мс', name, elapsed * 1000)
+    return wrapper
@@ -0,0 +1,30 @@
+"""SQLite-бэкенд с настройкой соединений для нескольких воркеров.
+
+На каждом новом соединении выполняет PRAGMA из `SQLITE_PRAGMAS`
+(или из ключа `PRAGMAS` базы в `DATABASES`) и по желанию открывает
+транзакции как `BEGIN IMMEDIATE`, чтобы запись сразу ждала блокировку
+по busy_timeout, а не падала с "database is locked" при её повышении.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def pragmas(self):
+        return self.settings_dict.get('PRAGMAS', settings.SQLITE_PRAGMAS)
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.settings_dict.get(
+                'IMMEDIATE_TRANSACTIONS',
+                settings.SQLITE_IMMEDIATE_TRANSACTIONS):
+            self.cursor().execute('BEGIN IMMEDIATE')
+        else:
+            super()._start_transaction_under_autocommit()
@@ -0,0 +1,47 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+# Сессии читаем только из основной базы: свежая сессия после входа
+# может ещё не доехать до реплики.
+PRIMARY_ONLY_APPS = ('sessions',)
+
+_state = threading.local()
+
+
+def pin_to_primary(pinned=True):
+    """Отправляет все чтения текущего потока в основную базу."""
+    _state.pinned = pinned
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+class ReplicaRouter:
+    """Чтения - на реплики из `DATABASE_REPLICAS`, записи - в `default`.
+
+    Чтения остаются в основной базе, если поток закреплён за ней
+    (запись в этом запросе или недавно в сессии) или если открыта
+    транзакция: внутри неё нужно видеть собственные изменения.
+    Связанные объекты читаются из той же базы, что и исходный объект.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (not replicas or is_pinned()
+                or model._meta.app_label in PRIMARY_ONLY_APPS
+                or connections['default'].in_atomic_block):
+            return 'default'
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
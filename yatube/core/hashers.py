@@ -0,0 +1,36 @@
+"""Политики хэширования паролей для `PASSWORD_HASH_POLICY`.
+
+Модуль не импортирует Django, чтобы его можно было читать из settings.
+"""
+HASHERS = 'django.contrib.auth.hashers.'
+
+# Основной алгоритм каждой политики: им хэшируются новые пароли.
+POLICIES = {
+    'pbkdf2': HASHERS + 'PBKDF2PasswordHasher',
+    # Память-ёмкий, при настройках Django проверяется быстрее PBKDF2;
+    # нужен пакет argon2-cffi.
+    'argon2': HASHERS + 'Argon2PasswordHasher',
+    # Нужен пакет bcrypt.
+    'bcrypt': HASHERS + 'BCryptSHA256PasswordHasher',
+    # Только для тестов: MD5 без растяжения ключа.
+    'fast': HASHERS + 'MD5PasswordHasher',
+}
+
+# Алгоритмы, чьи хэши принимаются при входе и перехэшируются основным.
+VERIFY_HASHERS = [
+    HASHERS + 'PBKDF2PasswordHasher',
+    HASHERS + 'PBKDF2SHA1PasswordHasher',
+    HASHERS + 'Argon2PasswordHasher',
+    HASHERS + 'BCryptSHA256PasswordHasher',
+]
+
+
+def password_hashers(policy):
+    """Значение `PASSWORD_HASHERS`: основной алгоритм первым."""
+    if policy not in POLICIES:
+        raise ValueError(
+            f'Неизвестная PASSWORD_HASH_POLICY {policy!r}, '
+            f'допустимы: {", ".join(POLICIES)}')
+    preferred = POLICIES[policy]
+    return [preferred] + [
+        hasher for hasher in VERIFY_HASHERS if hasher != preferred]
@@ -0,0 +1,144 @@
+"""Локальный генератор HTTP-нагрузки для бенчмарков страниц."""
+import contextlib
+import http.cookiejar
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer, WSGIRequestHandler)
+from django.core.wsgi import get_wsgi_application
+
+QUERIES_RE = re.compile(r'desc="(\d+) SQL"')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def running_server():
+    """Поднимает многопоточный WSGI-сервер на свободном порту."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class LoadClient:
+    """HTTP-клиент с cookie: сессией пользователя и CSRF-токеном."""
+
+    def __init__(self, base_url, cookies=None):
+        self.base_url = base_url
+        self.jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.jar), NoRedirectHandler)
+        host = urllib.parse.urlsplit(base_url).hostname
+        for name, value in (cookies or {}).items():
+            self.jar.set_cookie(http.cookiejar.Cookie(
+                0, name, value, None, False, host, False, False, '/',
+                True, False, None, False, None, None, {}))
+
+    def cookie(self, name):
+        for cookie in self.jar:
+            if cookie.name == name:
+                return cookie.value
+        return None
+
+    def request(self, path, data=None):
+        """Возвращает (время в секундах, статус, число SQL-запросов)."""
+        headers = {}
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(data).encode()
+            headers['X-CSRFToken'] = self.cookie('csrftoken') or ''
+        request = urllib.request.Request(
+            self.base_url + path, data=body, headers=headers)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                status, timing = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            error.read()
+            status, timing = error.code, error.headers
+        elapsed = time.perf_counter() - start
+        match = QUERIES_RE.search(timing.get('Server-Timing', ''))
+        return elapsed, status, int(match.group(1)) if match else None
+
+
+def percentile(values, percent):
+    """Перцентиль по ближайшему рангу для отсортированного списка."""
+    if not values:
+        return 0
+    rank = max(int(round(percent / 100 * len(values))) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def run_endpoint(client, make_request, total, concurrency):
+    """Выполняет `total` запросов в `concurrency` потоков.
+
+    `make_request(number)` возвращает путь и необязательные данные
+    формы для POST.
+    """
+    def call(number):
+        path, data = make_request(number)
+        return client.request(path, data)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(call, range(total)))
+    wall = time.perf_counter() - start
+    latencies = sorted(elapsed * 1000 for elapsed, _, _ in results)
+    queries = [count for _, _, count in results if count is not None]
+    return {
+        'requests': total,
+        'errors': sum(status >= 400 for _, status, _ in results),
+        'rps': round(total / wall, 1),
+        'p50': round(percentile(latencies, 50), 2),
+        'p95': round(percentile(latencies, 95), 2),
+        'p99': round(percentile(latencies, 99), 2),
+        'queries': max(queries) if queries else None,
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Список регрессий относительно сохранённого прогона.
+
+    Регрессией считается рост p95 или падение RPS больше чем на долю
+    `tolerance`, а также любой рост числа запросов к базе и ошибки.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['p95'] > base['p95'] * (1 + tolerance):
+            regressions.append(
+                f'{name}: p95 {result["p95"]} мс > {base["p95"]} мс')
+        if result['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(
+                f'{name}: RPS {result["rps"]} < {base["rps"]}')
+        if (result['queries'] or 0) > (base['queries'] or 0):
+            regressions.append(
+                f'{name}: SQL-запросов {result["queries"]} > '
+                f'{base["queries"]}')
+        if result['errors'] > base['errors']:
+            regressions.append(
+                f'{name}: ошибок {result["errors"]} > {base["errors"]}')
+    return regressions
@@ -0,0 +1,57 @@
+import time
+
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from core.benchmarks import temporary_database
+from core.hashers import POLICIES, password_hashers
+
+User = get_user_model()
+
+PASSWORD = 'bench-password-1'
+
+
+class Command(BaseCommand):
+    help = ('Измеряет входы в секунду на одно ядро при каждой политике '
+            'хэширования паролей и перехэширование старых хэшей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policies', nargs='+', choices=list(POLICIES),
+            default=list(POLICIES))
+        parser.add_argument(
+            '--seconds', type=float, default=2,
+            help='Сколько секунд входить под каждой политикой.')
+
+    def handle(self, *args, policies, seconds, **options):
+        self.stdout.write(
+            f'{"политика":>10} {"входов/с":>10} {"мс на вход":>11}')
+        with temporary_database():
+            for policy in policies:
+                with override_settings(
+                        PASSWORD_HASHERS=password_hashers(policy)):
+                    try:
+                        get_hasher().encode(PASSWORD, 'salt')
+                    except ValueError as error:
+                        self.stdout.write(f'{policy:>10} недоступна: {error}')
+                        continue
+                    rate = self._logins_per_second(policy, seconds)
+                self.stdout.write(
+                    f'{policy:>10} {rate:>10.1f} {1000 / rate:>11.2f}')
+
+    def _logins_per_second(self, policy, seconds):
+        # Хэш от PBKDF2: первый вход перехэширует его основным алгоритмом.
+        with override_settings(PASSWORD_HASHERS=password_hashers('pbkdf2')):
+            user = User.objects.create_user(f'bench-{policy}', None, PASSWORD)
+        authenticate(username=user.username, password=PASSWORD)
+        user.refresh_from_db()
+        if not user.password.startswith(get_hasher().algorithm):
+            raise CommandError(f'{policy}: хэш не обновился при входе')
+        logins = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            authenticate(username=user.username, password=PASSWORD)
+            logins += 1
+        return logins / (time.perf_counter() - start)
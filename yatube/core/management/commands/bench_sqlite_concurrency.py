@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.test.utils import override_settings
+
+from core.benchmarks import seed_posts, temporary_database
+from posts.models import Post
+
+User = get_user_model()
+
+BASELINE_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+class Command(BaseCommand):
+    help = ('Нагружает файловую базу SQLite параллельными чтениями и '
+            'записями без настройки и с SQLITE_PRAGMAS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--posts', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        profiles = (
+            ('без настройки', BASELINE_PRAGMAS, False),
+            ('настроенная', settings.SQLITE_PRAGMAS, True),
+        )
+        self.stdout.write(
+            f'{"профиль":>14} {"чтений/с":>10} {"записей/с":>10} '
+            f'{"locked":>7}')
+        for name, pragmas, immediate in profiles:
+            with override_settings(
+                    SQLITE_PRAGMAS=pragmas,
+                    SQLITE_IMMEDIATE_TRANSACTIONS=immediate):
+                reads, writes, locked = self._run(**options)
+            seconds = options['seconds']
+            self.stdout.write(
+                f'{name:>14} {reads / seconds:>10.0f} '
+                f'{writes / seconds:>10.0f} {locked:>7}')
+
+    def _run(self, readers, writers, seconds, posts, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'bench.sqlite3')
+            with temporary_database(path):
+                author = User.objects.create(username='bench')
+                seed_posts(posts, author)
+                connections.close_all()
+                return self._load(author, readers, writers, seconds)
+
+    def _load(self, author, readers, writers, seconds):
+        stats = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def work(operation, counter):
+            done = locked = 0
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        operation()
+                        done += 1
+                    except OperationalError:
+                        locked += 1
+            finally:
+                connections.close_all()
+            with lock:
+                stats[counter] += done
+                stats['locked'] += locked
+
+        def read():
+            list(Post.objects.feed()[:10])
+
+        def write():
+            Post.objects.create(author=author, text='Пост под нагрузкой')
+
+        threads = [
+            threading.Thread(target=work, args=(read, 'reads'))
+            for _ in range(readers)]
+        threads += [
+            threading.Thread(target=work, args=(write, 'writes'))
+            for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats['reads'], stats['writes'], stats['locked']
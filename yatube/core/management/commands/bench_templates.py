@@ -0,0 +1,60 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.benchmarks import measure, seed_posts, temporary_database
+from core.template_cache import warm_templates
+from posts.models import Group
+
+User = get_user_model()
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def templates_setting(cached):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    if cached:
+        templates[0]['APP_DIRS'] = False
+        templates[0]['OPTIONS']['loaders'] = CACHED_LOADERS
+    return templates
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время ответа страниц ленты с обычными и '
+            'кэширующим загрузчиками шаблонов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, posts, repeat, **options):
+        with temporary_database():
+            author = User.objects.create(username='bench')
+            group = Group.objects.create(title='Бенчмарк', slug='bench')
+            seed_posts(posts, author, group)
+            urls = ('/', f'/group/{group.slug}/', f'/profile/{author}/')
+            self.stdout.write(
+                f'{"страница":>20} {"обычные, мс":>12} {"кэш, мс":>9}')
+            for url in urls:
+                plain = self._measure(url, repeat, cached=False)
+                cached = self._measure(url, repeat, cached=True)
+                self.stdout.write(f'{url:>20} {plain:>12.2f} {cached:>9.2f}')
+
+    def _measure(self, url, repeat, cached):
+        client = Client()
+        # Кэш страниц главной спрятал бы стоимость рендера.
+        with override_settings(
+                TEMPLATES=templates_setting(cached),
+                POSTS_INDEX_CACHE_SIZE=0):
+            if cached:
+                warm_templates()
+            return measure(lambda: client.get(url), repeat)
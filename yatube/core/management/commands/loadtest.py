@@ -0,0 +1,150 @@
+import json
+import os
+import random
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.benchmarks import temporary_database
+from core.loadtest import (
+    LoadClient, compare_with_baseline, run_endpoint, running_server)
+from core.seeding import seed_database
+from posts.models import Group, Post
+
+User = get_user_model()
+
+ENDPOINTS = (
+    'index', 'group_list', 'profile', 'post_detail', 'post_create',
+    'post_edit')
+
+
+class Command(BaseCommand):
+    help = ('Засевает временную базу и нагружает страницы Yatube '
+            'локальным HTTP-генератором: p50/p95/p99, RPS и SQL '
+            'на запрос, со сравнением с сохранённым прогоном.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--endpoints', nargs='+', choices=ENDPOINTS, default=ENDPOINTS)
+        parser.add_argument(
+            '--baseline',
+            default=os.path.join(settings.BASE_DIR, 'loadtest_baseline.json'),
+            help='JSON с прошлыми результатами по размерам данных.')
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Записать результаты прогона как новый эталон.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Допустимое ухудшение p95 и RPS, доля от эталона.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'loadtest.sqlite3')
+            # Кэш страниц главной спрятал бы стоимость запроса к базе,
+            # а лимиты частоты оборвали бы пишущие сценарии.
+            with temporary_database(path), override_settings(
+                    POSTS_INDEX_CACHE_SIZE=0, SERVER_TIMING_HEADER=True,
+                    THROTTLE_RATES={}):
+                self._seed(options)
+                with running_server() as base_url:
+                    results = self._run(base_url, options)
+        self._report(results)
+        self._check_baseline(results, options)
+
+    def _seed(self, options):
+        seed_database(
+            options['authors'], options['groups'], options['posts'],
+            seed=options['seed'])
+        self.authors = list(User.objects.all())
+        self.groups = list(Group.objects.all())
+        self.writer = User.objects.create(username='loadtest')
+        self.own_posts = [
+            Post.objects.create(author=self.writer, text=f'Свой пост {i}')
+            for i in range(10)]
+        self.post_ids = list(Post.objects.values_list('pk', flat=True))
+        self.stdout.write(
+            f'Засеяно: {options["posts"]} постов, {len(self.groups)} '
+            f'групп, {len(self.authors)} авторов')
+
+    def _login(self, base_url):
+        client = Client()
+        client.force_login(self.writer)
+        load_client = LoadClient(base_url, {
+            settings.SESSION_COOKIE_NAME:
+                client.cookies[settings.SESSION_COOKIE_NAME].value})
+        # Страница формы выставляет cookie с CSRF-токеном.
+        load_client.request('/create/')
+        return load_client
+
+    def _requests(self):
+        choice = self.random.choice
+        return {
+            'index': lambda n: (f'/?page={n % 10 + 1}', None),
+            'group_list': lambda n: (f'/group/{choice(self.groups).slug}/',
+                                     None),
+            'profile': lambda n: (f'/profile/{choice(self.authors)}/', None),
+            'post_detail': lambda n: (f'/posts/{choice(self.post_ids)}/',
+                                      None),
+            'post_create': lambda n: ('/create/', {
+                'text': f'Пост под нагрузкой {n}',
+                'group': choice(self.groups).pk}),
+            'post_edit': lambda n: (
+                f'/posts/{choice(self.own_posts).pk}/edit/',
+                {'text': f'Правка под нагрузкой {n}'}),
+        }
+
+    def _run(self, base_url, options):
+        guest = LoadClient(base_url)
+        writer = self._login(base_url)
+        requests = self._requests()
+        results = {}
+        for name in options['endpoints']:
+            client = writer if name in ('post_create', 'post_edit') else guest
+            results[name] = run_endpoint(
+                client, requests[name], options['requests'],
+                options['concurrency'])
+        return results
+
+    def _report(self, results):
+        self.stdout.write(
+            f'{"страница":>12} {"RPS":>8} {"p50":>8} {"p95":>8} '
+            f'{"p99":>8} {"SQL":>5} {"ошибки":>7}')
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:>12} {result["rps"]:>8.1f} {result["p50"]:>8.2f} '
+                f'{result["p95"]:>8.2f} {result["p99"]:>8.2f} '
+                f'{result["queries"] or "-":>5} {result["errors"]:>7}')
+
+    def _check_baseline(self, results, options):
+        path = options['baseline']
+        baselines = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as stream:
+                baselines = json.load(stream)
+        scale = str(options['posts'])
+        if options['save_baseline']:
+            baselines[scale] = results
+            with open(path, 'w', encoding='utf-8') as stream:
+                json.dump(baselines, stream, indent=2, ensure_ascii=False)
+            self.stdout.write(f'Эталон для {scale} постов записан в {path}')
+            return
+        if scale not in baselines:
+            self.stdout.write(f'Эталона для {scale} постов нет в {path}')
+            return
+        regressions = compare_with_baseline(
+            results, baselines[scale], options['tolerance'])
+        if regressions:
+            raise CommandError(
+                'Регрессии относительно эталона:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from core.seeding import SEED_PASSWORD, Seeder
+
+
+class Command(BaseCommand):
+    help = ('Детерминированно заполняет пустую базу пользователями, '
+            'группами и постами через Faker и bulk_create.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--password', default=SEED_PASSWORD,
+            help='Пароль всех созданных пользователей.')
+
+    def handle(self, *args, **options):
+        seeder = Seeder(
+            options['seed'], batch_size=options['batch_size'],
+            password=options['password'], progress=self._progress)
+        try:
+            rates = seeder.run(
+                options['users'], options['groups'], options['posts'])
+        except IntegrityError as error:
+            raise CommandError(
+                f'База уже заполнена этим набором, нужна пустая: {error}')
+        self.stdout.write(self.style.SUCCESS('Готово: ' + ', '.join(
+            f'{table} {rate:.0f} строк/с' for table, rate in rates.items())))
+
+    def _progress(self, table, done, rate):
+        self.stdout.write(f'{table}: {done} строк, {rate:.0f} строк/с')
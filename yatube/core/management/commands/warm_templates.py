@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.template_cache import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны и сообщает о тех, что не собрались.'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        total, errors = warm_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        for name, error in errors:
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Не скомпилировано шаблонов: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {total} за {elapsed:.0f} мс'))
@@ -0,0 +1,141 @@
+import bisect
+import contextlib
+import threading
+import time
+
+TIME_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Стоимость одного запроса: SQL, рендер шаблонов и общее время."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0
+        self.queries = 0
+        self.db_time = 0
+        self.template_time = 0
+        self._template_depth = 0
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+
+def current_metrics():
+    return getattr(_local, 'metrics', None)
+
+
+@contextlib.contextmanager
+def collect_metrics():
+    metrics = RequestMetrics()
+    _local.metrics = metrics
+    try:
+        yield metrics
+    finally:
+        _local.metrics = None
+        metrics.finish()
+
+
+def time_query(execute, sql, params, many, context):
+    """Обёртка `connection.execute_wrapper`, считающая запросы."""
+    metrics = current_metrics()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def time_template():
+    """Замеряет рендер шаблона; вложенные шаблоны не считаются дважды."""
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    metrics._template_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._template_depth -= 1
+        if not metrics._template_depth:
+            metrics.template_time += time.perf_counter() - start
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        bounds = [str(bound) for bound in self.buckets] + ['inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'buckets': dict(zip(bounds, self.counts)),
+        }
+
+
+class ViewMetrics:
+    """Гистограммы стоимости запросов по имени view в памяти процесса."""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def observe(self, view_name, metrics):
+        with self._lock:
+            histograms = self._views.get(view_name)
+            if histograms is None:
+                histograms = self._views[view_name] = {
+                    'total_ms': Histogram(TIME_BUCKETS_MS),
+                    'db_ms': Histogram(TIME_BUCKETS_MS),
+                    'template_ms': Histogram(TIME_BUCKETS_MS),
+                    'queries': Histogram(QUERY_BUCKETS),
+                }
+            histograms['total_ms'].observe(metrics.total * 1000)
+            histograms['db_ms'].observe(metrics.db_time * 1000)
+            histograms['template_ms'].observe(metrics.template_time * 1000)
+            histograms['queries'].observe(metrics.queries)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view_name: {
+                    name: histogram.snapshot()
+                    for name, histogram in histograms.items()}
+                for view_name, histograms in self._views.items()}
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+
+view_metrics = ViewMetrics()
+
+
+def server_timing(metrics, request):
+    """Значение заголовка `Server-Timing` для запроса."""
+    parts = [
+        f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} SQL"',
+        f'tpl;dur={metrics.template_time * 1000:.2f}',
+    ]
+    processors = getattr(request, 'context_processor_timings', None)
+    if processors:
+        parts.append(f'ctx;dur={sum(processors.values()) * 1000:.2f}')
+    parts.append(f'total;dur={metrics.total * 1000:.2f}')
+    return ', '.join(parts)
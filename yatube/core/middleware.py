@@ -0,0 +1,101 @@
+import contextlib
+import math
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+from core.db_router import pin_to_primary
+from core.metrics import (
+    collect_metrics, server_timing, time_query, view_metrics)
+from core.throttling import get_store, throttle_key
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PINNED_UNTIL_KEY = 'db_pinned_until'
+
+
+class ReplicaStickinessMiddleware:
+    """Закрепляет запросы сессии за основной базой после записи.
+
+    Пишущий запрос и все запросы той же сессии в течение
+    `REPLICA_STICKY_SECONDS` читают из `default`, поэтому пользователь
+    сразу видит свой новый пост, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        is_write = request.method not in SAFE_METHODS
+        pinned_until = request.session.get(PINNED_UNTIL_KEY, 0)
+        pin_to_primary(is_write or pinned_until > time.time())
+        try:
+            response = self.get_response(request)
+        finally:
+            pin_to_primary(False)
+        if is_write and response.status_code < 400:
+            request.session[PINNED_UNTIL_KEY] = (
+                time.time() + settings.REPLICA_STICKY_SECONDS)
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Собирает стоимость каждого запроса по имени view.
+
+    Считает SQL-запросы и их время, время рендера шаблонов и общее
+    время, отдаёт их в заголовке `Server-Timing` (если включён
+    `SERVER_TIMING_HEADER`) и копит гистограммы в `view_metrics`.
+    Ставится первым, чтобы учесть и остальные middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(time_query))
+            metrics = stack.enter_context(collect_metrics())
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        view_metrics.observe(view_name, metrics)
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = server_timing(metrics, request)
+        return response
+
+
+class ThrottleMiddleware:
+    """Ограничивает частоту пишущих запросов к выбранным view.
+
+    Лимиты `THROTTLE_RATES` задаются по имени view как (запросов, за
+    секунд) и считаются отдельно для каждого пользователя, а для
+    анонимов - для каждого IP. Сверх лимита отвечает `429` с
+    заголовком `Retry-After`. Остальные запросы стоят один поиск в
+    словаре.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in SAFE_METHODS:
+            return None
+        view_name = request.resolver_match.view_name
+        rate = settings.THROTTLE_RATES.get(view_name)
+        if rate is None:
+            return None
+        retry_after = get_store().take(
+            throttle_key(request, view_name), *rate)
+        if not retry_after:
+            return None
+        response = HttpResponse(
+            'Слишком много запросов, попробуйте позже.', status=429)
+        response['Retry-After'] = math.ceil(retry_after)
+        return response
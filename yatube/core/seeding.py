@@ -0,0 +1,128 @@
+"""Быстрое детерминированное заполнение базы пользователями и постами."""
+import datetime
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from faker import Faker
+
+from posts.counters import rebuild_counters
+from posts.models import (
+    Group, Post, RevisionedModel, keep_pub_date, reserve_revisions)
+from posts.timeline import timeline
+
+User = get_user_model()
+
+SEED_PASSWORD = 'yatube-seed'
+# Тексты постов берутся из пула: генерировать миллион текстов Faker
+# дольше, чем вставлять их в базу.
+TEXT_POOL_SIZE = 2000
+# Посты идут с шагом в минуту назад от этой даты.
+START_DATE = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Seeder:
+    """Генерирует пользователей, группы и посты пачками `bulk_create`.
+
+    При одном `seed` на пустой базе получается один и тот же набор:
+    те же имена, тексты, даты и распределение постов по авторам и
+    группам. Пароль у всех пользователей один, хэшируется один раз.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, password=SEED_PASSWORD,
+                 progress=None):
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(seed)
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.password = password
+        self.progress = progress or (lambda table, done, rate: None)
+        self.rates = {}
+
+    def _insert(self, table, model, objects):
+        start = time.monotonic()
+        done = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                done += self._flush(model, batch)
+                batch = []
+                self.progress(table, done, done / self._since(start))
+        if batch:
+            done += self._flush(model, batch)
+        self.rates[table] = done / self._since(start)
+        self.progress(table, done, self.rates[table])
+        return done
+
+    def _since(self, start):
+        return time.monotonic() - start or 1e-9
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            if issubclass(model, RevisionedModel):
+                # bulk_create обходит save(), поэтому ревизии раздаём сами:
+                # новые группы и посты должны сдвинуть ETag и кэш страниц.
+                last = reserve_revisions(len(batch))
+                for revision, post in enumerate(
+                        batch, last - len(batch) + 1):
+                    post.revision = revision
+            model.objects.bulk_create(batch)
+        return len(batch)
+
+    def users(self, total):
+        password = make_password(self.password)
+        for number in range(total):
+            yield User(
+                username=f'{self.fake.user_name()}-{number}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                password=password)
+
+    def groups(self, total):
+        for number in range(total):
+            yield Group(
+                title=self.fake.sentence(nb_words=3).rstrip('.'),
+                slug=f'group-{number}',
+                description=self.fake.text(max_nb_chars=200))
+
+    def posts(self, total, author_ids, group_ids):
+        texts = [
+            self.fake.text(max_nb_chars=400)
+            for _ in range(min(total, TEXT_POOL_SIZE))]
+        choice = self.random.choice
+        for number in range(total):
+            yield Post(
+                text=choice(texts),
+                author_id=choice(author_ids),
+                # Примерно каждый пятый пост без группы.
+                group_id=(
+                    choice(group_ids)
+                    if group_ids and self.random.random() < 0.8 else None),
+                pub_date=START_DATE - datetime.timedelta(minutes=number))
+
+    def run(self, users, groups, posts):
+        """Создаёт данные и возвращает скорость вставки по таблицам."""
+        first = User.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        self._insert('users', User, self.users(users))
+        author_ids = list(User.objects.filter(pk__gt=first).values_list(
+            'pk', flat=True))
+        first = Group.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        self._insert('groups', Group, self.groups(groups))
+        group_ids = list(Group.objects.filter(pk__gt=first).values_list(
+            'pk', flat=True))
+        if posts and author_ids:
+            with keep_pub_date():
+                self._insert(
+                    'posts', Post, self.posts(posts, author_ids, group_ids))
+        rebuild_counters()
+        timeline.reset()
+        return self.rates
+
+
+def seed_database(users, groups, posts, seed=0, **kwargs):
+    return Seeder(seed, **kwargs).run(users, groups, posts)
@@ -0,0 +1,31 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from core.context_processors.timing import timed
+from core.metrics import time_template
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with time_template():
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Шаблоны Django с замером рендера и каждого context processor."""
+
+    def __init__(self, params):
+        super().__init__(params)
+        engine = self.engine
+        # Движок кэширует импортированные процессоры в cached_property,
+        # подменяем их обёрнутыми один раз на процесс.
+        engine.template_context_processors = tuple(
+            timed(processor)
+            for processor in engine.template_context_processors)
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return TimedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
@@ -0,0 +1,46 @@
+import os
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+
+
+def _loader_dirs(loaders):
+    for loader in loaders:
+        # Кэширующий загрузчик хранит настоящие загрузчики в `loaders`.
+        yield from _loader_dirs(getattr(loader, 'loaders', ()))
+        if hasattr(loader, 'get_dirs'):
+            yield from loader.get_dirs()
+
+
+def template_names(engine):
+    """Имена всех шаблонов из каталогов загрузчиков движка."""
+    names = set()
+    for directory in _loader_dirs(engine.template_loaders):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                names.add(os.path.relpath(path, directory).replace(
+                    os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    """Заранее компилирует все шаблоны Django-движков.
+
+    С кэширующим загрузчиком первый запрос к странице больше не платит
+    за чтение и разбор шаблонов. Возвращает число шаблонов и список
+    пар (имя, ошибка) для тех, что не скомпилировались.
+    """
+    total = 0
+    errors = []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except Exception as error:
+                errors.append((name, error))
+            else:
+                total += 1
+    return total, errors
@@ -0,0 +1,12 @@
+from django.test import Client, TestCase
+
+
+class ContextProcessorTimingTest(TestCase):
+    def test_timings_recorded_per_processor(self):
+        response = Client().get('/about/author/')
+        timings = response.wsgi_request.context_processor_timings
+        for name in ('core.context_processors.year.year',
+                     'core.context_processors.get_username.get_username'):
+            with self.subTest(name=name):
+                self.assertIn(name, timings)
+                self.assertGreaterEqual(timings[name], 0)
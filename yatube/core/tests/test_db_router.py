@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TransactionTestCase, override_settings
+
+from posts.models import Post
+
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+class ReplicaRouterTest(TransactionTestCase):
+    """Реплики - отдельные SQLite-файлы без репликации.
+
+    Поэтому запись видна только при чтении из основной базы, а чтение
+    с реплики её не находит.
+    """
+    databases = {'default', 'replica1', 'replica2'}
+
+    def setUp(self):
+        self.user = User.objects.create(username='auth')
+        self.post = Post.objects.create(author=self.user, text='Пост')
+
+    def test_reads_go_to_replicas(self):
+        self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(
+            Post.objects.using('default').filter(pk=self.post.pk).exists())
+        response = Client().get(f'/posts/{self.post.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_session_sticks_to_primary_after_write(self):
+        author_client = Client()
+        author_client.force_login(self.user)
+        response = author_client.post(
+            '/create/', {'text': 'Новый пост'}, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['count'], 2)
+        response = Client().get(f'/profile/{self.user.username}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_related_objects_read_from_instance_database(self):
+        post = Post.objects.using('default').get(pk=self.post.pk)
+        self.assertEqual(post.author, self.user)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_primary(self):
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from core.checks import check_password_hash_policy
+from core.hashers import POLICIES, password_hashers
+from core.throttling import get_store
+
+User = get_user_model()
+
+
+class PasswordHashPolicyTest(SimpleTestCase):
+    def test_preferred_hasher_first(self):
+        hashers = password_hashers('argon2')
+        self.assertEqual(hashers[0], POLICIES['argon2'])
+        self.assertEqual(len(hashers), len(set(hashers)))
+        self.assertIn(POLICIES['pbkdf2'], hashers)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            password_hashers('rot13')
+
+    def test_tests_use_fast_hasher(self):
+        self.assertEqual(settings.PASSWORD_HASHERS[0], POLICIES['fast'])
+
+    def test_fast_policy_warning(self):
+        warnings = check_password_hash_policy(None)
+        self.assertEqual(
+            [warning.id for warning in warnings], ['core.W001'])
+        with override_settings(
+                DEBUG=True, PASSWORD_HASH_POLICY='pbkdf2',
+                PASSWORD_HASHERS=password_hashers('pbkdf2')):
+            self.assertEqual(check_password_hash_policy(None), [])
+
+
+class RehashOnLoginTest(TestCase):
+    def setUp(self):
+        get_store().clear()
+
+    def test_login_rehashes_with_preferred_hasher(self):
+        with override_settings(PASSWORD_HASHERS=password_hashers('pbkdf2')):
+            user = User.objects.create_user('auth', None, 'secret-pass-1')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        response = Client().post(
+            '/auth/login/',
+            {'username': 'auth', 'password': 'secret-pass-1'})
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('md5$'))
+        self.assertTrue(user.check_password('secret-pass-1'))
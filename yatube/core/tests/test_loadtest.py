@@ -0,0 +1,24 @@
+from django.test import SimpleTestCase
+
+from core.loadtest import compare_with_baseline, percentile
+
+
+class LoadTestStatsTest(SimpleTestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0)
+
+    def test_regressions_against_baseline(self):
+        base = {'p95': 100, 'rps': 50, 'queries': 5, 'errors': 0}
+        within = dict(base, p95=115, rps=45)
+        self.assertEqual(
+            compare_with_baseline({'index': within}, {'index': base}, 0.2),
+            [])
+        worse = {'p95': 150, 'rps': 30, 'queries': 6, 'errors': 1}
+        regressions = compare_with_baseline(
+            {'index': worse, 'profile': worse}, {'index': base}, 0.2)
+        self.assertEqual(len(regressions), 4)
+        self.assertTrue(all(r.startswith('index:') for r in regressions))
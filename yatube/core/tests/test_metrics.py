@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from core.metrics import Histogram, view_metrics
+from posts.models import Post
+
+User = get_user_model()
+
+
+class HistogramTest(SimpleTestCase):
+    def test_values_fall_into_upper_bounds(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 3, 50):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['buckets'], {'1': 2, '10': 1, 'inf': 1})
+        self.assertEqual(snapshot['count'], 4)
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='auth')
+        cls.admin = User.objects.create(username='admin', is_staff=True)
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        view_metrics.clear()
+        self.guest_client = Client()
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_server_timing_header(self):
+        response = self.guest_client.get(f'/profile/{self.user}/')
+        header = response['Server-Timing']
+        for name in ('db;dur=', 'tpl;dur=', 'ctx;dur=', 'total;dur='):
+            with self.subTest(name=name):
+                self.assertIn(name, header)
+
+    def test_header_off_by_default(self):
+        response = self.guest_client.get('/about/tech/')
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_histograms_by_view_name(self):
+        self.guest_client.get(f'/profile/{self.user}/')
+        self.guest_client.get(f'/profile/{self.user}/')
+        profile = view_metrics.snapshot()['posts:profile']
+        self.assertEqual(profile['total_ms']['count'], 2)
+        self.assertGreater(profile['queries']['sum'], 0)
+        self.assertGreater(profile['template_ms']['sum'], 0)
+
+    def test_metrics_endpoint_for_staff_only(self):
+        self.guest_client.get('/about/tech/')
+        response = self.guest_client.get('/metrics/requests/')
+        self.assertEqual(response.status_code, 302)
+        admin_client = Client()
+        admin_client.force_login(self.admin)
+        response = admin_client.get('/metrics/requests/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('about:tech', response.json()['views'])
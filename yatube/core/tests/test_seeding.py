@@ -0,0 +1,51 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.seeding import SEED_PASSWORD, seed_database
+from posts.counters import post_count
+from posts.models import Group, Post, PostCounter
+
+User = get_user_model()
+
+
+class SeedingTest(TestCase):
+    def snapshot(self):
+        return (
+            list(User.objects.order_by('pk').values_list(
+                'username', 'first_name', 'last_name')),
+            list(Group.objects.order_by('pk').values_list('slug', 'title')),
+            list(Post.objects.order_by('pk').values_list(
+                'text', 'pub_date', 'author__username', 'group__slug')),
+        )
+
+    def test_same_seed_gives_same_dataset(self):
+        seed_database(5, 2, 50, seed=1)
+        first = self.snapshot()
+        Post.objects.all().delete()
+        Group.objects.all().delete()
+        User.objects.all().delete()
+        seed_database(5, 2, 50, seed=1)
+        self.assertEqual(self.snapshot(), first)
+        seed_database(5, 0, 0, seed=2)
+        self.assertNotEqual(self.snapshot()[0][5:], first[0])
+
+    def test_users_share_prehashed_password(self):
+        seed_database(3, 1, 10)
+        users = list(User.objects.all())
+        self.assertEqual(len({user.password for user in users}), 1)
+        self.assertTrue(users[0].check_password(SEED_PASSWORD))
+
+    def test_command_rebuilds_counters(self):
+        call_command(
+            'seed', users=4, groups=2, posts=30, batch_size=7,
+            stdout=io.StringIO())
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(post_count(PostCounter.SCOPE_ALL), 30)
+        self.assertEqual(
+            list(Group.objects.order_by('pk').values_list(
+                'revision', flat=True)), [1, 2])
+        self.assertEqual(
+            Post.objects.order_by('revision').last().revision, 32)
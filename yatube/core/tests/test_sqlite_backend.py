@@ -0,0 +1,30 @@
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+
+class SQLitePragmasTest(TestCase):
+    @override_settings(SQLITE_PRAGMAS={'busy_timeout': 1234,
+                                       'synchronous': 'OFF'})
+    def test_pragmas_applied_on_connect(self):
+        """Новое соединение получает PRAGMA из SQLITE_PRAGMAS."""
+        wrapper = connection.copy()
+        conn = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            pragma = conn.execute('PRAGMA busy_timeout').fetchone()[0]
+            synchronous = conn.execute('PRAGMA synchronous').fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(pragma, 1234)
+        self.assertEqual(synchronous, 0)
+
+
+class ImmediateTransactionTest(TransactionTestCase):
+    @override_settings(SQLITE_IMMEDIATE_TRANSACTIONS=True)
+    def test_immediate_transactions(self):
+        """atomic() открывает транзакцию через BEGIN IMMEDIATE."""
+        connection.ensure_connection()
+        with self.assertNumQueries(1) as context:
+            with transaction.atomic():
+                pass
+        self.assertEqual(context.captured_queries[0]['sql'],
+                         'BEGIN IMMEDIATE')
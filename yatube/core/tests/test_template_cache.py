@@ -0,0 +1,53 @@
+import importlib
+import os
+from unittest import mock
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import SimpleTestCase, override_settings
+
+from core.template_cache import template_names, warm_templates
+from yatube import settings_production
+
+
+class TemplateCacheTest(SimpleTestCase):
+    def test_template_names_cover_project_templates(self):
+        names = template_names(engines['django'].engine)
+        for name in ('base.html', 'includes/paginator.html',
+                     'posts/index.html', 'users/login.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, names)
+
+    @override_settings(
+        TEMPLATES=settings_production.TEMPLATES,
+        DEBUG=settings_production.DEBUG)
+    def test_warm_up_fills_cached_loader(self):
+        total, errors = warm_templates()
+        self.assertEqual(errors, [])
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertEqual(len(loader.get_template_cache), total)
+
+    @override_settings(
+        TEMPLATES=settings_production.TEMPLATES,
+        DEBUG=settings_production.DEBUG)
+    def test_production_profile(self):
+        self.assertTrue(settings_production.TEMPLATES_WARM_UP)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIsInstance(loader, CachedLoader)
+
+    def test_production_secrets_from_environment(self):
+        environ = {
+            'DJANGO_SECRET_KEY': 'production-key',
+            'DJANGO_ALLOWED_HOSTS': 'yatube.example, www.yatube.example',
+        }
+        with mock.patch.dict(os.environ, environ):
+            production = importlib.reload(settings_production)
+            self.assertEqual(production.SECRET_KEY, 'production-key')
+            self.assertEqual(
+                production.ALLOWED_HOSTS,
+                ['yatube.example', 'www.yatube.example'])
+        with mock.patch.dict(os.environ, clear=True):
+            production = importlib.reload(settings_production)
+            self.assertEqual(production.SECRET_KEY, '')
+            self.assertEqual(production.ALLOWED_HOSTS, [])
+        importlib.reload(settings_production)
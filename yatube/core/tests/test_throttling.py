@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from core.throttling import MemoryStore, SQLiteStore, get_store
+
+User = get_user_model()
+
+
+class TokenBucketTest(SimpleTestCase):
+    def test_memory_store_refills_over_time(self):
+        store = MemoryStore()
+        self.assertEqual(store.take('key', 2, 60, now=0), 0)
+        self.assertEqual(store.take('key', 2, 60, now=0), 0)
+        self.assertEqual(store.take('key', 2, 60, now=0), 30)
+        self.assertEqual(store.take('other', 2, 60, now=0), 0)
+        self.assertEqual(store.take('key', 2, 60, now=30), 0)
+
+    def test_memory_store_forgets_idle_buckets(self):
+        store = MemoryStore(max_keys=2)
+        store.take('first', 1, 10, now=0)
+        store.take('second', 1, 10, now=5)
+        store.take('third', 1, 10, now=12)
+        self.assertEqual(sorted(store._buckets), ['second', 'third'])
+
+    def test_memory_store_evicts_least_recent_active_bucket(self):
+        store = MemoryStore(max_keys=2)
+        store.take('first', 1, 60, now=0)
+        store.take('second', 1, 60, now=1)
+        store.take('first', 1, 60, now=2)
+        store.take('third', 1, 60, now=3)
+        self.assertEqual(list(store._buckets), ['first', 'third'])
+
+    def test_memory_store_keeps_each_bucket_period(self):
+        store = MemoryStore()
+        store.take('fast', 1, 10, now=0)
+        store.take('slow', 1, 600, now=5)
+        store.take('other', 1, 10, now=20)
+        self.assertEqual(list(store._buckets), ['slow', 'other'])
+        self.assertEqual(store.take('slow', 1, 600, now=20), 585)
+
+    def test_sqlite_store_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'throttle.sqlite3')
+            first, second = SQLiteStore(path), SQLiteStore(path)
+            self.assertEqual(first.take('key', 2, 60, now=0), 0)
+            self.assertEqual(second.take('key', 2, 60, now=0), 0)
+            self.assertEqual(first.take('key', 2, 60, now=0), 30)
+            first.connection.close()
+            second.connection.close()
+
+    def test_sqlite_store_prunes_full_buckets(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SQLiteStore(
+                os.path.join(tmp_dir, 'throttle.sqlite3'), prune_every=3)
+            store.take('fast', 1, 10, now=0)
+            store.take('slow', 1, 600, now=0)
+            store.take('other', 1, 10, now=20)
+            keys = [row[0] for row in store.connection.execute(
+                'SELECT key FROM throttle_bucket ORDER BY key')]
+            self.assertEqual(keys, ['other', 'slow'])
+            self.assertEqual(store.take('slow', 1, 600, now=20), 580)
+            store.connection.close()
+
+
+@override_settings(THROTTLE_RATES={
+    'users:signup': (2, 60), 'posts:post_create': (1, 60)})
+class ThrottleMiddlewareTest(TestCase):
+    def setUp(self):
+        get_store().clear()
+        self.guest_client = Client()
+
+    def tearDown(self):
+        get_store().clear()
+
+    def test_anonymous_limited_by_ip(self):
+        for _ in range(2):
+            response = self.guest_client.post('/auth/signup/', {})
+            self.assertEqual(response.status_code, 200)
+        response = self.guest_client.post('/auth/signup/', {})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        response = self.guest_client.post(
+            '/auth/signup/', {}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    def test_safe_methods_not_limited(self):
+        for _ in range(3):
+            response = self.guest_client.get('/auth/signup/')
+            self.assertEqual(response.status_code, 200)
+
+    def test_users_limited_separately(self):
+        first, second = Client(), Client()
+        first.force_login(User.objects.create(username='first'))
+        second.force_login(User.objects.create(username='second'))
+        self.assertEqual(first.post('/create/', {}).status_code, 200)
+        self.assertEqual(first.post('/create/', {}).status_code, 429)
+        self.assertEqual(second.post('/create/', {}).status_code, 200)
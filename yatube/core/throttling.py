@@ -0,0 +1,162 @@
+"""Ограничение частоты запросов корзиной токенов (token bucket)."""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+def refill(tokens, updated, now, capacity, period):
+    """Сколько токенов в корзине к моменту `now`."""
+    return min(capacity, tokens + (now - updated) * capacity / period)
+
+
+def spend(tokens, capacity, period):
+    """Забирает токен: возвращает остаток и сколько ждать при отказе."""
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) * period / capacity
+
+
+class MemoryStore:
+    """Корзины в памяти процесса: быстро, но у каждого воркера свои.
+
+    Корзины лежат в порядке последнего обращения. Спереди снимаются
+    уже полные (не тронутые дольше своего периода), а сверх `max_keys`
+    вытесняются самые давние, так что уборка не обходит все ключи.
+    """
+
+    def __init__(self, max_keys=10000, **options):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period, now=None):
+        """Списывает токен из корзины `key`.
+
+        Возвращает 0, если запрос можно пропустить, иначе число секунд
+        до появления токена.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated, _ = self._buckets.pop(
+                key, (capacity, now, period))
+            tokens, retry_after = spend(
+                refill(tokens, updated, now, capacity, period),
+                capacity, period)
+            self._buckets[key] = (tokens, now, period)
+            self._prune(now)
+        return retry_after
+
+    def _prune(self, now):
+        buckets = self._buckets
+        while buckets:
+            key = next(iter(buckets))
+            _, updated, period = buckets[key]
+            # Корзина, не тронутая дольше периода, снова полна.
+            if len(buckets) <= self.max_keys and now - updated < period:
+                break
+            buckets.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteStore:
+    """Корзины в файле SQLite, общие для всех воркеров на машине.
+
+    У каждого потока своё соединение. Чтение и запись корзины идут в
+    одной транзакции `BEGIN IMMEDIATE`, поэтому воркеры не теряют
+    списания друг друга. Каждое `prune_every`-е списание потока
+    удаляет корзины, которые уже снова полны, иначе таблица росла бы
+    с каждым новым адресом.
+    """
+
+    def __init__(self, location, timeout=5, prune_every=1000, **options):
+        self.location = location
+        self.timeout = timeout
+        self.prune_every = prune_every
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.location, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode = WAL')
+            # full_at - момент, когда корзина снова полна и не нужна.
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL, updated REAL, '
+                'full_at REAL NOT NULL DEFAULT 0)')
+            columns = {
+                row[1] for row in connection.execute(
+                    'PRAGMA table_info(throttle_bucket)')}
+            if 'full_at' not in columns:
+                connection.execute(
+                    'ALTER TABLE throttle_bucket '
+                    'ADD COLUMN full_at REAL NOT NULL DEFAULT 0')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS throttle_bucket_full_at '
+                'ON throttle_bucket (full_at)')
+            self._local.connection = connection
+            self._local.takes = 0
+        return connection
+
+    def take(self, key, capacity, period, now=None):
+        # Время стены, а не monotonic: оно общее для процессов.
+        now = time.time() if now is None else now
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM throttle_bucket WHERE key = ?',
+                [key]).fetchone()
+            tokens, updated = row or (capacity, now)
+            tokens, retry_after = spend(
+                refill(tokens, updated, now, capacity, period),
+                capacity, period)
+            full_at = now + (capacity - tokens) * period / capacity
+            connection.execute(
+                'INSERT OR REPLACE INTO throttle_bucket VALUES (?, ?, ?, ?)',
+                [key, tokens, now, full_at])
+            self._local.takes += 1
+            if self._local.takes % self.prune_every == 0:
+                connection.execute(
+                    'DELETE FROM throttle_bucket WHERE full_at <= ?', [now])
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return retry_after
+
+    def clear(self):
+        self.connection.execute('DELETE FROM throttle_bucket')
+
+
+_store = None
+_store_config = None
+
+
+def get_store():
+    """Хранилище корзин из `THROTTLE_STORE`, одно на процесс."""
+    global _store, _store_config
+    config = settings.THROTTLE_STORE
+    if _store is None or config != _store_config:
+        options = {
+            key.lower(): value for key, value in config.items()
+            if key != 'BACKEND'}
+        _store = import_string(config['BACKEND'])(**options)
+        _store_config = config
+    return _store
+
+
+def throttle_key(request, view_name):
+    user = request.user
+    if user.is_authenticated:
+        return f'{view_name}:user:{user.pk}'
+    return f'{view_name}:ip:{request.META.get("REMOTE_ADDR")}'
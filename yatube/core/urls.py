@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'core'
+
+urlpatterns = [
+    path('metrics/requests/', views.request_metrics,
+         name='request_metrics'),
+]
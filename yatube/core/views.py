@@ -0,0 +1,9 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from core.metrics import view_metrics
+
+
+@staff_member_required
+def request_metrics(request):
+    return JsonResponse({'views': view_metrics.snapshot()})
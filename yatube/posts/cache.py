@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class FeedPageCache:
+    """LRU-кэш отрендеренных страниц ленты в памяти процесса.
+
+    Сигналы сбрасывают только кэш своего процесса, поэтому ключ
+    страницы включает текущую ревизию из базы: правка в любом воркере
+    сдвигает её, и старые страницы просто перестают читаться.
+    Считает попадания и промахи для метрик.
+    """
+
+    def __init__(self, setting_name):
+        self.setting_name = setting_name
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        return getattr(settings, self.setting_name)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._pages[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._pages[key] = value
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_size:
+                self._pages.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._pages),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+index_page_cache = FeedPageCache('POSTS_INDEX_CACHE_SIZE')
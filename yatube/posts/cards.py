@@ -0,0 +1,49 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'includes/card_author.html'
+
+
+def card_version(post):
+    """Версия карточки: хэш всех полей, которые в ней выводятся."""
+    author = post.author
+    group = post.group
+    parts = (
+        post.text,
+        post.pub_date.isoformat(),
+        author.username,
+        author.get_full_name(),
+        group.slug if group else '',
+    )
+    return hashlib.md5('\x00'.join(parts).encode()).hexdigest()
+
+
+def card_key(post):
+    return f'post_card:{post.pk}:{card_version(post)}'
+
+
+def render_cards(posts):
+    """Возвращает карточки постов, беря готовые из кэша одним запросом.
+
+    Карточка хранится под ключом из id и версии поста, поэтому после
+    `post_edit` старая запись просто перестаёт читаться.
+    """
+    cache = caches[settings.POSTS_CARD_CACHE]
+    posts = list(posts)
+    keys = [card_key(post) for post in posts]
+    cached = cache.get_many(keys)
+    missing = {}
+    cards = []
+    for key, post in zip(keys, posts):
+        card = cached.get(key)
+        if card is None:
+            card = render_to_string(CARD_TEMPLATE, {'post': post})
+            missing[key] = card
+        cards.append(mark_safe(card))
+    if missing:
+        cache.set_many(missing, settings.POSTS_CARD_CACHE_TIMEOUT)
+    return cards
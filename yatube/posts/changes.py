@@ -0,0 +1,94 @@
+import datetime
+
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+from .models import Post, PostTombstone, Sequence, reserve_revisions
+
+PRUNED_SEQUENCE = 'tombstones_pruned'
+
+
+def record_deletion(post):
+    PostTombstone.objects.create(
+        post_id=post.pk, revision=reserve_revisions())
+
+
+def touch_posts(posts):
+    """Выдаёт постам новые ревизии одним UPDATE.
+
+    Нужно, когда меняются данные, которые лента изменений берёт не из
+    самого поста: имя автора или slug группы. Под посты резервируется
+    диапазон от меньшего id до большего, ревизия поста - его место в
+    диапазоне.
+    """
+    with transaction.atomic():
+        bounds = posts.aggregate(low=Min('pk'), high=Max('pk'))
+        if bounds['low'] is None:
+            return 0
+        span = bounds['high'] - bounds['low'] + 1
+        first = reserve_revisions(span) - span + 1
+        return posts.update(
+            revision=F('pk') + (first - bounds['low']),
+            updated_at=timezone.now())
+
+
+def pruned_revision():
+    """Последняя ревизия, чьи следы удалений уже стёрты."""
+    return Sequence.objects.filter(name=PRUNED_SEQUENCE).values_list(
+        'value', flat=True).first() or 0
+
+
+def prune_tombstones(days):
+    """Удаляет следы старше `days` дней и запоминает их ревизию."""
+    border = timezone.now() - datetime.timedelta(days=days)
+    old = PostTombstone.objects.filter(deleted_at__lt=border)
+    last = old.order_by('-revision').values_list(
+        'revision', flat=True).first()
+    if last is None:
+        return 0
+    Sequence.objects.update_or_create(
+        name=PRUNED_SEQUENCE, defaults={'value': last})
+    deleted, _ = old.filter(revision__lte=last).delete()
+    return deleted
+
+
+def _post_change(post):
+    return {
+        'type': 'upsert',
+        'id': post.pk,
+        'revision': post.revision,
+        'post': {
+            'text': post.text,
+            'pub_date': post.pub_date.isoformat(),
+            'updated_at': post.updated_at.isoformat(),
+            'author': post.author.username,
+            'group': post.group.slug if post.group else None,
+        },
+    }
+
+
+def _tombstone_change(tombstone):
+    return {
+        'type': 'delete',
+        'id': tombstone.post_id,
+        'revision': tombstone.revision,
+        'deleted_at': tombstone.deleted_at.isoformat(),
+    }
+
+
+def changes_since(revision, limit):
+    """Изменения постов после `revision` в порядке ревизий.
+
+    Правки и удаления берутся из двух таблиц по индексу ревизии и
+    сливаются, поэтому стоимость зависит от числа изменений, а не от
+    размера таблицы постов.
+    """
+    posts = Post.objects.feed().changed_since(revision)[:limit + 1]
+    tombstones = PostTombstone.objects.filter(
+        revision__gt=revision).order_by('revision')[:limit + 1]
+    changes = [_post_change(post) for post in posts]
+    changes.extend(_tombstone_change(tombstone) for tombstone in tombstones)
+    changes.sort(key=lambda change: change['revision'])
+    has_more = len(changes) > limit
+    return changes[:limit], has_more
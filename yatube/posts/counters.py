@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Post, PostCounter, reserve_revisions
+
+
+def _scope_queryset(scope, object_id):
+    if scope == PostCounter.SCOPE_AUTHOR:
+        return Post.objects.filter(author_id=object_id)
+    if scope == PostCounter.SCOPE_GROUP:
+        return Post.objects.filter(group_id=object_id)
+    return Post.objects.all()
+
+
+def post_count(scope, object_id=0):
+    """Возвращает число постов из счётчика.
+
+    Отсутствующий счётчик считается по таблице постов один раз и
+    сохраняется, дальше значение поддерживают сигналы `Post`.
+    """
+    counter = PostCounter.objects.filter(
+        scope=scope, object_id=object_id).values_list('count', flat=True)
+    for count in counter:
+        return count
+    counter, _ = PostCounter.objects.get_or_create(
+        scope=scope, object_id=object_id,
+        defaults={'count': _scope_queryset(scope, object_id).count()})
+    return counter.count
+
+
+def change_count(scope, object_id, delta):
+    """Сдвигает уже существующий счётчик на `delta`.
+
+    Счётчик может отставать от таблицы: вставки пачками обходят
+    сигналы. Поэтому он не опускается ниже нуля, иначе удаление поста
+    упёрлось бы в CHECK положительного поля.
+    """
+    PostCounter.objects.filter(scope=scope, object_id=object_id).update(
+        count=Greatest(F('count') + delta, 0))
+
+
+def drop_count(scope, object_id):
+    PostCounter.objects.filter(scope=scope, object_id=object_id).delete()
+
+
+def rebuild_counters():
+    """Пересчитывает все счётчики по таблице постов."""
+    counters = [PostCounter(
+        scope=PostCounter.SCOPE_ALL, object_id=0,
+        count=Post.objects.count())]
+    for scope, field in ((PostCounter.SCOPE_AUTHOR, 'author_id'),
+                         (PostCounter.SCOPE_GROUP, 'group_id')):
+        rows = (Post.objects.filter(**{f'{field}__isnull': False})
+                .order_by().values_list(field).annotate(total=Count('pk')))
+        counters.extend(
+            PostCounter(scope=scope, object_id=object_id, count=total)
+            for object_id, total in rows)
+    with transaction.atomic():
+        PostCounter.objects.all().delete()
+        PostCounter.objects.bulk_create(counters, batch_size=500)
+        # Числа на страницах изменились, а с ними и их ETag.
+        reserve_revisions()
+    return len(counters)
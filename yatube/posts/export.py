@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import zlib
+
+from .models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+
+
+def iter_posts(batch_size=2000):
+    """Постранично обходит посты по id, держа в памяти одну пачку."""
+    last_pk = 0
+    while True:
+        rows = list(
+            Post.objects.order_by('pk').filter(pk__gt=last_pk).values_list(
+                'pk', 'text', 'pub_date', 'author__username', 'group__slug'
+            )[:batch_size])
+        if not rows:
+            return
+        for pk, text, pub_date, author, group in rows:
+            yield {
+                'id': pk,
+                'text': text,
+                'pub_date': pub_date.isoformat(),
+                'author': author,
+                'group': group,
+            }
+        last_pk = rows[-1][0]
+
+
+def iter_jsonl(posts):
+    for post in posts:
+        yield json.dumps(post, ensure_ascii=False) + '\n'
+
+
+def iter_csv(posts):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, EXPORT_FIELDS)
+    writer.writeheader()
+    for post in posts:
+        writer.writerow(post)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_gzip(chunks, level=6):
+    """Сжимает поток строк в gzip, не собирая его целиком."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_posts(fmt='jsonl', compress=False, batch_size=2000):
+    """Поток выгрузки постов: строки JSONL/CSV или байты gzip."""
+    serialize = iter_csv if fmt == 'csv' else iter_jsonl
+    chunks = serialize(iter_posts(batch_size))
+    if compress:
+        return iter_gzip(chunks)
+    return chunks
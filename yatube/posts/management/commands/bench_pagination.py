@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+
+from core.benchmarks import measure, seed_posts, temporary_database
+from posts.models import Post
+from posts.paginator import KeysetPaginator
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает задержку offset- и keyset-пагинации '
+            'на растущей глубине страниц.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--per-page', type=int, default=10)
+        parser.add_argument(
+            '--depths', type=int, nargs='+',
+            default=[1, 10, 100, 1000, 5000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            self._run(**options)
+
+    def _run(self, posts, per_page, depths, repeat, **options):
+        author = User.objects.create(username='bench')
+        seed_posts(posts, author)
+        queryset = Post.objects.all()
+        ordered = queryset.order_by(*KeysetPaginator.ordering)
+        self.stdout.write(f'{"page":>8} {"offset, ms":>12} {"keyset, ms":>12}')
+        for depth in depths:
+            if (depth - 1) * per_page >= posts:
+                break
+            offset_ms = measure(
+                lambda: list(Paginator(queryset, per_page).page(depth)),
+                repeat)
+            cursor = None
+            if depth > 1:
+                last = ordered[(depth - 1) * per_page - 1]
+                cursor = KeysetPaginator.encode_cursor('n', last)
+            keyset_ms = measure(
+                lambda: list(KeysetPaginator(queryset, per_page).page(cursor)),
+                repeat)
+            self.stdout.write(
+                f'{depth:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}')
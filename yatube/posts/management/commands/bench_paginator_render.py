@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from core.benchmarks import measure
+from posts.paginator import CountedPaginator
+
+FULL_RANGE_TEMPLATE = Template(
+    '{% for i in page_obj.paginator.page_range %}'
+    '{% if page_obj.number == i %}<li class="page-item active">'
+    '<span class="page-link">{{ i }}</span></li>'
+    '{% else %}<li class="page-item">'
+    '<a class="page-link" href="?page={{ i }}">{{ i }}</a></li>'
+    '{% endif %}{% endfor %}')
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время рендера пагинатора со всеми номерами '
+            'страниц и с окном вокруг текущей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, nargs='+',
+            default=[10, 100, 1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, pages, repeat, **options):
+        windowed = get_template('includes/paginator.html')
+        self.stdout.write(
+            f'{"pages":>8} {"full, ms":>10} {"window, ms":>11} '
+            f'{"full, KB":>9} {"window, KB":>11}')
+        for num_pages in pages:
+            paginator = CountedPaginator(
+                [], 10, count=num_pages * 10, allow_empty_first_page=True)
+            page_obj = paginator.page(num_pages // 2 or 1)
+            context = {'page_obj': page_obj}
+            full_ms = measure(
+                lambda: FULL_RANGE_TEMPLATE.render(Context(context)), repeat)
+            window_ms = measure(lambda: windowed.render(context), repeat)
+            full_kb = len(FULL_RANGE_TEMPLATE.render(Context(context))) / 1024
+            window_kb = len(windowed.render(context)) / 1024
+            self.stdout.write(
+                f'{num_pages:>8} {full_ms:>10.2f} {window_ms:>11.2f} '
+                f'{full_kb:>9.1f} {window_kb:>11.1f}')
@@ -0,0 +1,50 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core.benchmarks import measure, seed_posts, temporary_database
+from posts.models import Post
+from posts.search import SearchResults
+
+User = get_user_model()
+
+# Словарь побольше, чтобы искомое слово было редким, как в жизни.
+WORDS = [f'слово{i}' for i in range(5000)]
+
+
+def first_page_and_count(posts):
+    """Работа страницы поиска: первые 10 результатов и их общее число.
+
+    Оба запроса выполняются всегда, даже при пустой выдаче.
+    """
+    list(posts[:10])
+    posts.count()
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск через FTS5 с перебором icontains.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, nargs='+', default=[100000, 1000000])
+        parser.add_argument('--query', default='слово42')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, posts, query, repeat, **options):
+        rnd = random.Random(0)
+        self.stdout.write(
+            f'{"posts":>9} {"icontains, ms":>14} {"fts5, ms":>10}')
+        for total in posts:
+            with temporary_database():
+                author = User.objects.create(username='bench')
+                seed_posts(
+                    total, author,
+                    text=lambda i: ' '.join(rnd.choices(WORDS, k=12)))
+                scan = Post.objects.feed().filter(text__icontains=query)
+                scan_ms = measure(
+                    lambda: first_page_and_count(scan), repeat)
+                results = SearchResults(query)
+                fts_ms = measure(
+                    lambda: first_page_and_count(results), repeat)
+            self.stdout.write(f'{total:>9} {scan_ms:>14.2f} {fts_ms:>10.2f}')
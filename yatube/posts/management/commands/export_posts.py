@@ -0,0 +1,41 @@
+import contextlib
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.export import export_posts
+
+
+class Command(BaseCommand):
+    help = ('Выгружает все посты с автором и группой в JSONL или CSV '
+            'с постоянным расходом памяти.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--output', default='-', help='Файл или "-" для stdout.')
+
+    def handle(self, *args, **options):
+        chunks = export_posts(
+            options['format'], options['gzip'], options['batch_size'])
+        with self._open(options['output'], options['gzip']) as write:
+            for chunk in chunks:
+                write(chunk)
+
+    @contextlib.contextmanager
+    def _open(self, path, binary):
+        if path == '-':
+            if binary:
+                yield sys.stdout.buffer.write
+            else:
+                yield lambda chunk: self.stdout.write(chunk, ending='')
+            return
+        if binary:
+            output = open(path, 'wb')
+        else:
+            output = open(path, 'w', encoding='utf-8', newline='')
+        with output:
+            yield output.write
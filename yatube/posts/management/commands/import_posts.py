@@ -0,0 +1,169 @@
+import contextlib
+import csv
+import json
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.counters import rebuild_counters
+from posts.models import (
+    Group, Post, Sequence, keep_pub_date, reserve_revisions)
+from posts.timeline import timeline
+
+User = get_user_model()
+
+CHECKPOINT_PREFIX = 'import_posts:'
+
+
+class LookupCache:
+    """Кэш id по естественному ключу, догружаемый пачками."""
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.ids = {}
+
+    def load(self, keys):
+        missing = {key for key in keys if key and key not in self.ids}
+        if missing:
+            # Ненайденные ключи тоже запоминаем, чтобы не искать их снова.
+            self.ids.update(dict.fromkeys(missing))
+            self.ids.update(self.queryset.filter(
+                **{f'{self.field}__in': missing}
+            ).values_list(self.field, 'pk'))
+
+    def get(self, key):
+        return self.ids.get(key)
+
+
+class Command(BaseCommand):
+    help = ('Импортирует посты из JSONL или CSV (поля text, author, group, '
+            'pub_date) пачками через bulk_create.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='Файл с постами или "-" для stdin.')
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'),
+            help='Формат входа, по умолчанию по расширению файла.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--checkpoint',
+            help='Имя точки возврата: число импортированных записей '
+                 'хранится в базе в одной транзакции с пачкой.')
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Пропустить записи, уже учтённые в --checkpoint.')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or self._guess_format(options['path'])
+        skip = self._read_checkpoint(options) if options['resume'] else 0
+        self.authors = LookupCache(User.objects.all(), 'username')
+        self.groups = LookupCache(Group.objects.all(), 'slug')
+        self.started = time.monotonic()
+        self.imported = self.skipped = 0
+        with self._open(options['path']) as stream:
+            records = self._records(stream, fmt)
+            position = 0
+            batch = []
+            with keep_pub_date():
+                for position, record in enumerate(records, 1):
+                    if position <= skip:
+                        continue
+                    batch.append(record)
+                    if len(batch) >= options['batch_size']:
+                        self._flush(batch, position, options)
+                        batch = []
+                if batch:
+                    self._flush(batch, position, options)
+        rebuild_counters()
+        timeline.reset()
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано {self.imported}, пропущено {self.skipped}'))
+
+    def _guess_format(self, path):
+        if path.endswith('.csv'):
+            return 'csv'
+        return 'jsonl'
+
+    @contextlib.contextmanager
+    def _open(self, path):
+        if path == '-':
+            yield sys.stdin
+            return
+        with open(path, encoding='utf-8', newline='') as stream:
+            yield stream
+
+    def _records(self, stream, fmt):
+        if fmt == 'csv':
+            yield from csv.DictReader(stream)
+            return
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise CommandError(f'Строка {number}: {error}')
+
+    def _checkpoint_name(self, options):
+        name = CHECKPOINT_PREFIX + options['checkpoint']
+        if len(name) > Sequence._meta.get_field('name').max_length:
+            raise CommandError('Слишком длинное имя --checkpoint')
+        return name
+
+    def _read_checkpoint(self, options):
+        if not options['checkpoint']:
+            raise CommandError('--resume требует --checkpoint')
+        return Sequence.objects.filter(
+            name=self._checkpoint_name(options)
+        ).values_list('value', flat=True).first() or 0
+
+    def _write_checkpoint(self, options, position):
+        # Пишется в транзакции пачки: после сбоя позиция и посты либо
+        # сохранены вместе, либо нет, и --resume не вставит их дважды.
+        if not options['checkpoint']:
+            return
+        Sequence.objects.update_or_create(
+            name=self._checkpoint_name(options),
+            defaults={'value': position})
+
+    def _build_post(self, record):
+        author_id = self.authors.get(record.get('author'))
+        if not author_id or not record.get('text'):
+            return None
+        post = Post(
+            text=record['text'],
+            author_id=author_id,
+            group_id=self.groups.get(record.get('group')))
+        pub_date = parse_datetime(record.get('pub_date') or '')
+        if pub_date is None:
+            pub_date = timezone.now()
+        elif timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        post.pub_date = pub_date
+        return post
+
+    def _flush(self, batch, position, options):
+        self.authors.load(record.get('author') for record in batch)
+        self.groups.load(record.get('group') for record in batch)
+        posts = [self._build_post(record) for record in batch]
+        posts = [post for post in posts if post is not None]
+        with transaction.atomic():
+            # bulk_create обходит save(), поэтому ревизии раздаём сами.
+            last = reserve_revisions(len(posts)) if posts else 0
+            for revision, post in enumerate(posts, last - len(posts) + 1):
+                post.revision = revision
+            Post.objects.bulk_create(posts)
+            self._write_checkpoint(options, position)
+        self.imported += len(posts)
+        self.skipped += len(batch) - len(posts)
+        elapsed = time.monotonic() - self.started or 1e-9
+        self.stdout.write(
+            f'{position} записей: импортировано {self.imported}, '
+            f'{self.imported / elapsed:.0f} постов/с')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Удаляет старые следы удалённых постов из ленты изменений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=90,
+            help='Сколько дней хранить следы удалений.')
+
+    def handle(self, *args, days, **options):
+        deleted = prune_tombstones(days)
+        self.stdout.write(self.style.SUCCESS(f'Удалено следов: {deleted}'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов, например после массового импорта.'
+
+    def handle(self, *args, **options):
+        total = rebuild_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано счётчиков: {total}'))
@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Group, Post
+
+MODELS = {'post': Post, 'group': Group}
+
+
+class Command(BaseCommand):
+    help = ('Обходит пачками посты или группы, изменённые после '
+            'заданной ревизии, и печатает их в JSONL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, default=0)
+        parser.add_argument(
+            '--model', choices=sorted(MODELS), default='post')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, since, model, batch_size, **options):
+        queryset = MODELS[model].objects.all()
+        revision = since
+        total = 0
+        while True:
+            batch = list(queryset.changed_since(revision).values(
+                'id', 'revision', 'updated_at')[:batch_size])
+            if not batch:
+                break
+            for row in batch:
+                row['updated_at'] = row['updated_at'].isoformat()
+                self.stdout.write(json.dumps(row))
+            revision = batch[-1]['revision']
+            total += len(batch)
+        self.stderr.write(f'Изменений: {total}, последняя ревизия: {revision}')
@@ -0,0 +1,89 @@
+from django.db import migrations, models
+from django.db.models import F, Max
+import django.utils.timezone
+
+# SQLite пересоздаёт posts_post при добавлении полей и теряет триггеры
+# полнотекстового индекса из 0008, поэтому ставим их заново.
+SEARCH_TRIGGERS_SQL = (
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_insert "
+    "AFTER INSERT ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_delete "
+    "AFTER DELETE ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_post_fts_update "
+    "AFTER UPDATE OF text ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+    "INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')",
+)
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in SEARCH_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+def assign_revisions(apps, schema_editor):
+    # Номера выдаются двумя UPDATE на всю таблицу, а не запросом на
+    # строку: ревизия группы - её id, поста - id после всех групп.
+    db_alias = schema_editor.connection.alias
+    Sequence = apps.get_model('posts', 'Sequence')
+    groups = apps.get_model('posts', 'Group').objects.using(db_alias)
+    posts = apps.get_model('posts', 'Post').objects.using(db_alias)
+    last_group = groups.aggregate(last=Max('pk'))['last'] or 0
+    last_post = posts.aggregate(last=Max('pk'))['last'] or 0
+    groups.update(revision=F('pk'))
+    posts.update(revision=F('pk') + last_group, updated_at=F('pub_date'))
+    Sequence.objects.using(db_alias).create(
+        name='revision', value=last_group + last_post)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Ревизия'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, verbose_name='Дата изменения'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Ревизия'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, default=django.utils.timezone.now, verbose_name='Дата изменения'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(assign_revisions, migrations.RunPython.noop),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop),
+    ]
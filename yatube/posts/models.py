@@ -1,10 +1,78 @@
+import contextlib
+import threading
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 User = get_user_model()
 
 
-class Post(models.Model):
+class Sequence(models.Model):
+    """Именованный монотонный счётчик в базе."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}={self.value}'
+
+
+def reserve_revisions(count=1, name='revision'):
+    """Резервирует `count` номеров ревизий, возвращает последний.
+
+    UPDATE блокирует строку счётчика до конца транзакции, так что
+    параллельные записи получают разные номера.
+    """
+    with transaction.atomic():
+        updated = Sequence.objects.filter(name=name).update(
+            value=F('value') + count)
+        if not updated:
+            Sequence.objects.get_or_create(name=name)
+            Sequence.objects.filter(name=name).update(
+                value=F('value') + count)
+        return Sequence.objects.get(name=name).value
+
+
+def current_revision(name='revision'):
+    """Последний выданный номер ревизии, 0 - если их ещё не было."""
+    return Sequence.objects.filter(name=name).values_list(
+        'value', flat=True).first() or 0
+
+
+class RevisionQuerySet(models.QuerySet):
+    def changed_since(self, revision):
+        """Объекты, изменённые после ревизии `revision`, по порядку."""
+        return self.filter(revision__gt=revision).order_by('revision')
+
+
+class RevisionedModel(models.Model):
+    """Модель с временем и глобальным номером последнего изменения."""
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Дата изменения')
+    revision = models.BigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name='Ревизия')
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            self.revision = reserve_revisions()
+            super().save(*args, **kwargs)
+
+
+class PostQuerySet(RevisionQuerySet):
+    def feed(self):
+        """Посты для ленты с автором и группой, загруженными одним JOIN."""
+        return self.select_related('author', 'group')
+
+
+class Post(RevisionedModel):
     text = models.TextField(
         help_text='Введите текст',
         verbose_name='Текст поста')
@@ -26,17 +94,113 @@ class Post(models.Model):
         help_text='Выбирите название группы'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['group', '-pub_date'], name='post_group_pub_date_idx'),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pub_date_idx'),
+            models.Index(
+                fields=['-pub_date', 'id'], name='post_pub_date_id_idx'),
+        ]
 
     def __str__(self):
         return self.text[:15]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Группа на момент загрузки нужна счётчикам при переносе поста.
+        instance._loaded_group_id = instance.__dict__.get('group_id')
+        return instance
+
+
+_pub_date_state = threading.local()
+
 
-class Group(models.Model):
+@contextlib.contextmanager
+def keep_pub_date():
+    """Сохраняет заданные `pub_date` новых постов в текущем потоке.
+
+    `auto_now_add` перезаписывает дату и в `bulk_create`, а импорту и
+    засеву нужны даты из источника. Посты без даты по-прежнему
+    получают текущее время, другие потоки флаг не видят.
+    """
+    previous = getattr(_pub_date_state, 'keep', False)
+    _pub_date_state.keep = True
+    try:
+        yield
+    finally:
+        _pub_date_state.keep = previous
+
+
+def _keep_explicit_dates(field):
+    # Подкласс поля поменял бы его тип и миграции, поэтому оборачиваем
+    # pre_save самого поля.
+    pre_save = field.pre_save
+
+    def keeping_pre_save(model_instance, add):
+        value = getattr(model_instance, field.attname)
+        if add and value is not None and getattr(
+                _pub_date_state, 'keep', False):
+            return value
+        return pre_save(model_instance, add)
+
+    field.pre_save = keeping_pre_save
+
+
+_keep_explicit_dates(Post._meta.get_field('pub_date'))
+
+
+class Group(RevisionedModel):
     title = models.CharField(max_length=200, verbose_name='Группа')
     slug = models.SlugField(unique=True)
     description = models.TextField(verbose_name='Описание группы')
 
+    objects = RevisionQuerySet.as_manager()
+
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Прежний slug нужен ленте изменений: он есть в данных постов.
+        instance._loaded_slug = instance.__dict__.get('slug')
+        return instance
+
+
+class PostCounter(models.Model):
+    """Денормализованное число постов: всего, у автора или в группе."""
+    SCOPE_ALL = 'all'
+    SCOPE_AUTHOR = 'author'
+    SCOPE_GROUP = 'group'
+    SCOPES = (
+        (SCOPE_ALL, 'Все посты'),
+        (SCOPE_AUTHOR, 'Посты автора'),
+        (SCOPE_GROUP, 'Посты группы'),
+    )
+
+    scope = models.CharField(max_length=10, choices=SCOPES)
+    object_id = models.PositiveIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('scope', 'object_id')
+
+    def __str__(self):
+        return f'{self.scope}:{self.object_id}={self.count}'
+
+
+class PostTombstone(models.Model):
+    """След удалённого поста для ленты изменений."""
+    post_id = models.PositiveIntegerField(db_index=True)
+    revision = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.post_id}@{self.revision}'
@@ -0,0 +1,161 @@
+import base64
+
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class CountedPaginator(Paginator):
+    """Пагинатор, которому число объектов передано заранее.
+
+    Позволяет взять количество из счётчика вместо `COUNT(*)`.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+def page_window(page, on_each_side=2, on_ends=1):
+    """Номера страниц вокруг текущей плюс крайние страницы.
+
+    Пропуски между группами обозначены `None`, так что длина списка
+    не зависит от общего числа страниц.
+    """
+    num_pages = page.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        return list(range(1, num_pages + 1))
+    start = max(page.number - on_each_side, 1)
+    end = min(page.number + on_each_side, num_pages)
+    window = []
+    if start > on_ends + 1:
+        window.extend(range(1, on_ends + 1))
+        window.append(None)
+        window.extend(range(start, end + 1))
+    else:
+        window.extend(range(1, end + 1))
+    if end < num_pages - on_ends:
+        window.append(None)
+        window.extend(range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        window.extend(range(end + 1, num_pages + 1))
+    return window
+
+
+class KeysetPage(Page):
+    """Страница курсорной пагинации.
+
+    Совместима с `Page`, но вместо номеров страниц хранит курсоры
+    на соседние страницы.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Keyset page>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+
+class KeysetPaginator(Paginator):
+    """Пагинатор по ключу (pub_date, id) без COUNT(*) и OFFSET.
+
+    Страница выбирается курсором: закодированной парой ключей
+    последнего (или первого) поста соседней страницы.
+    """
+
+    keyset = True
+    ordering = ('-pub_date', 'id')
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(
+            object_list.order_by(*self.ordering), per_page, **kwargs)
+
+    @staticmethod
+    def encode_cursor(direction, post):
+        raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(
+                (cursor + padding).encode()).decode()
+            direction, pub_date, pk = raw.split('|')
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (ValueError, UnicodeError):
+            return None
+        if direction not in ('n', 'p') or pub_date is None:
+            return None
+        return direction, pub_date, pk
+
+    def get_page(self, cursor):
+        """Возвращает страницу по курсору, при ошибке - первую страницу."""
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            return self._first_page()
+        direction, pub_date, pk = decoded
+        if direction == 'n':
+            return self._page_after(pub_date, pk)
+        return self._page_before(pub_date, pk)
+
+    def page(self, cursor):
+        return self.get_page(cursor)
+
+    def _fetch(self, queryset):
+        return list(queryset[:self.per_page + 1])
+
+    def _build_page(self, posts, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if posts and has_next:
+            next_cursor = self.encode_cursor('n', posts[-1])
+        if posts and has_previous:
+            previous_cursor = self.encode_cursor('p', posts[0])
+        return KeysetPage(posts, self, next_cursor, previous_cursor)
+
+    def _first_page(self):
+        posts = self._fetch(self.object_list)
+        return self._build_page(
+            posts[:self.per_page], len(posts) > self.per_page, False)
+
+    def _after(self, pub_date, pk):
+        # Лишняя граница pub_date__lte превращает условие в диапазон по
+        # индексу: без неё SQLite обходит индекс с самого начала.
+        return self.object_list.filter(
+            Q(pub_date__lte=pub_date),
+            Q(pub_date__lt=pub_date) | Q(pk__gt=pk))
+
+    def _before(self, pub_date, pk):
+        return self.object_list.filter(
+            Q(pub_date__gte=pub_date),
+            Q(pub_date__gt=pub_date) | Q(pk__lt=pk)
+        ).order_by('pub_date', '-id')
+
+    def _page_after(self, pub_date, pk):
+        posts = self._fetch(self._after(pub_date, pk))
+        return self._build_page(
+            posts[:self.per_page], len(posts) > self.per_page, True)
+
+    def _page_before(self, pub_date, pk):
+        posts = self._fetch(self._before(pub_date, pk))
+        has_previous = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        posts.reverse()
+        return self._build_page(posts, True, has_previous)
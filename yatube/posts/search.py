@@ -0,0 +1,65 @@
+import re
+
+from django.db import connection
+
+from .models import Post
+
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match(query):
+    """Превращает запрос пользователя в выражение FTS5.
+
+    Каждое слово ищется как префикс, все слова обязательны, а
+    операторы FTS5 из ввода не пропускаются.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+
+class SearchResults:
+    """Ранжированная выдача поиска, которую можно отдать в `Paginator`.
+
+    Из индекса за раз берутся только id нужного среза, сами посты
+    подгружаются одним запросом вместе с авторами и группами.
+    """
+
+    def __init__(self, query):
+        self.match = build_match(query)
+        self.query = query
+
+    def count(self):
+        if not self.match:
+            return 0
+        if not fts_available():
+            return Post.objects.filter(text__icontains=self.query).count()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM posts_post_fts '
+                'WHERE posts_post_fts MATCH %s', [self.match])
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        if not self.match:
+            return []
+        start = item.start or 0
+        limit = item.stop - start
+        if not fts_available():
+            return list(Post.objects.feed().filter(
+                text__icontains=self.query)[start:item.stop])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid FROM posts_post_fts '
+                'WHERE posts_post_fts MATCH %s ORDER BY rank '
+                'LIMIT %s OFFSET %s', [self.match, limit, start])
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
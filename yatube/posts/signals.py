@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .cache import index_page_cache
+from .changes import record_deletion, touch_posts
+from .counters import change_count, drop_count
+from .models import Group, Post, PostCounter, reserve_revisions
+from .timeline import timeline
+
+User = get_user_model()
+
+# Поля пользователя, которые выводятся в карточках постов.
+AUTHOR_DISPLAY_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, '_loaded_group_id', None)
+    if created:
+        change_count(PostCounter.SCOPE_ALL, 0, 1)
+        change_count(PostCounter.SCOPE_AUTHOR, instance.author_id, 1)
+        if instance.group_id:
+            change_count(PostCounter.SCOPE_GROUP, instance.group_id, 1)
+    elif old_group_id != instance.group_id:
+        if old_group_id:
+            change_count(PostCounter.SCOPE_GROUP, old_group_id, -1)
+        if instance.group_id:
+            change_count(PostCounter.SCOPE_GROUP, instance.group_id, 1)
+    instance._loaded_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    change_count(PostCounter.SCOPE_ALL, 0, -1)
+    change_count(PostCounter.SCOPE_AUTHOR, instance.author_id, -1)
+    if instance.group_id:
+        change_count(PostCounter.SCOPE_GROUP, instance.group_id, -1)
+
+
+@receiver(post_delete, sender=Post)
+def leave_tombstone(sender, instance, **kwargs):
+    record_deletion(instance)
+
+
+# Лента и кэш страниц живут вне базы: их трогаем только после COMMIT,
+# иначе откат оставит в них несохранённые изменения.
+@receiver(post_save, sender=Post)
+def add_to_timeline(sender, instance, **kwargs):
+    transaction.on_commit(lambda: timeline.add(instance))
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_timeline(sender, instance, **kwargs):
+    post_id = instance.pk
+    transaction.on_commit(lambda: timeline.remove(post_id))
+
+
+@receiver(post_delete, sender=Group)
+def drop_group_count(sender, instance, **kwargs):
+    drop_count(PostCounter.SCOPE_GROUP, instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_author_count(sender, instance, **kwargs):
+    drop_count(PostCounter.SCOPE_AUTHOR, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_index_pages(sender, **kwargs):
+    transaction.on_commit(index_page_cache.clear)
+
+
+@receiver(post_save, sender=User)
+def bump_revision_on_rename(sender, instance, update_fields=None, **kwargs):
+    # Имя автора есть на страницах его постов, а ревизия - часть ключа
+    # кэша страниц и ETag. Вход пользователя сохраняет только last_login.
+    if update_fields and not AUTHOR_DISPLAY_FIELDS & set(update_fields):
+        return
+    reserve_revisions()
+    transaction.on_commit(index_page_cache.clear)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+def bump_revision_on_delete(sender, **kwargs):
+    # Страница удалённой группы или автора не должна отвечать 304.
+    reserve_revisions()
+
+
+# Лента изменений отдаёт с постом username автора и slug группы, поэтому
+# их смена выдаёт постам новые ревизии.
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (
+            update_fields and 'username' not in update_fields):
+        return
+    instance._saved_username = User.objects.filter(
+        pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def touch_posts_of_renamed_author(sender, instance, **kwargs):
+    old_username = instance.__dict__.pop('_saved_username', None)
+    if old_username is not None and old_username != instance.username:
+        touch_posts(Post.objects.filter(author=instance))
+
+
+@receiver(post_save, sender=Group)
+def touch_posts_of_renamed_group(sender, instance, created, **kwargs):
+    old_slug = getattr(instance, '_loaded_slug', None)
+    if not created and old_slug != instance.slug:
+        touch_posts(Post.objects.filter(group=instance))
+    instance._loaded_slug = instance.slug
+
+
+@receiver(pre_delete, sender=Group)
+def touch_posts_of_deleted_group(sender, instance, **kwargs):
+    # После pre_delete SET_NULL отвяжет посты, и найти их будет нельзя.
+    touch_posts(Post.objects.filter(group=instance))
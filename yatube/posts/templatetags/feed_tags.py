@@ -0,0 +1,69 @@
+from django import template
+from django.http import QueryDict
+
+from posts.cache import index_page_cache
+from posts.cards import render_cards
+from posts.models import current_revision
+from posts.paginator import page_window as get_page_window
+
+
+register = template.Library()
+
+
+class IndexPageCacheNode(template.Node):
+    def __init__(self, nodelist, page_obj):
+        self.nodelist = nodelist
+        self.page_obj = page_obj
+
+    def render(self, context):
+        page_obj = self.page_obj.resolve(context)
+        if page_obj.number is None or index_page_cache.max_size <= 0:
+            # Курсорные страницы не кэшируем: у них нет номера.
+            # Выключенный кэш не тратит запрос на ревизию.
+            return self.nodelist.render(context)
+        key = (current_revision(), page_obj.number, page_obj.paginator.count)
+        content = index_page_cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            index_page_cache.set(key, content)
+        return content
+
+
+@register.tag
+def cache_index_page(parser, token):
+    """Кэширует фрагмент главной страницы по номеру страницы.
+
+    Использование::
+
+        {% cache_index_page page_obj %}...{% endcache_index_page %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} ожидает один аргумент: page_obj')
+    nodelist = parser.parse(('endcache_index_page',))
+    parser.delete_first_token()
+    return IndexPageCacheNode(nodelist, parser.compile_filter(bits[1]))
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Отрендеренные карточки постов страницы, по возможности из кэша."""
+    return render_cards(posts)
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=2, on_ends=1):
+    """Окно номеров страниц для пагинатора, `None` - пропуск."""
+    return get_page_window(page_obj, on_each_side, on_ends)
+
+
+@register.simple_tag(takes_context=True)
+def page_url(context, **params):
+    """Ссылка на другую страницу с сохранением остальных GET-параметров."""
+    request = context.get('request')
+    query = request.GET.copy() if request else QueryDict(mutable=True)
+    for key in ('page', 'cursor'):
+        query.pop(key, None)
+    query.update(params)
+    return '?' + query.urlencode()
@@ -0,0 +1,140 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..cache import FeedPageCache, index_page_cache
+from ..cards import card_key, render_cards
+from ..models import Post, Group, reserve_revisions
+
+
+User = get_user_model()
+
+
+class FeedPageCacheTest(TestCase):
+    @override_settings(POSTS_INDEX_CACHE_SIZE=2)
+    def test_lru_eviction(self):
+        cache = FeedPageCache('POSTS_INDEX_CACHE_SIZE')
+        cache.set(1, 'first')
+        cache.set(2, 'second')
+        cache.get(1)
+        cache.set(3, 'third')
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), 'first')
+        self.assertEqual(cache.stats()['size'], 2)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+
+class IndexPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.admin = User.objects.create(username='admin', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Тестовый пост')
+
+    def setUp(self):
+        index_page_cache.clear()
+        self.guest_client = Client()
+
+    def post_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.guest_client.get('/')
+        return response, [
+            query for query in context.captured_queries
+            if 'FROM "posts_post" INNER JOIN' in query['sql']]
+
+    def test_second_request_served_from_cache(self):
+        self.post_queries()
+        hits = index_page_cache.hits
+        response, queries = self.post_queries()
+        self.assertEqual(queries, [])
+        self.assertEqual(index_page_cache.hits, hits + 1)
+        self.assertContains(response, 'Тестовый пост')
+
+    def test_signals_invalidate_cache(self):
+        self.post_queries()
+        self.post.text = 'Изменённый пост'
+        self.post.save()
+        response, queries = self.post_queries()
+        self.assertContains(response, 'Изменённый пост')
+        self.group.slug = 'new-slug'
+        self.group.save()
+        response, queries = self.post_queries()
+        self.assertContains(response, '/group/new-slug/')
+
+    def test_change_in_other_process_invalidates_cache(self):
+        self.post_queries()
+        # Другой воркер правит пост: до нашего кэша его сигнал не дойдёт.
+        Post.objects.filter(pk=self.post.pk).update(text='Правка извне')
+        reserve_revisions()
+        response, queries = self.post_queries()
+        self.assertNotEqual(queries, [])
+        self.assertContains(response, 'Правка извне')
+
+    def test_author_rename_invalidates_cache(self):
+        self.post_queries()
+        self.user.first_name = 'Лев'
+        self.user.last_name = 'Толстой'
+        self.user.save()
+        response, queries = self.post_queries()
+        self.assertContains(response, 'Лев Толстой')
+
+    def test_login_keeps_cache(self):
+        self.post_queries()
+        self.user.save(update_fields=['last_login'])
+        response, queries = self.post_queries()
+        self.assertEqual(queries, [])
+
+    def test_stats_for_staff_only(self):
+        response = self.guest_client.get('/metrics/feed-cache/')
+        self.assertEqual(response.status_code, 302)
+        admin_client = Client()
+        admin_client.force_login(self.admin)
+        response = admin_client.get('/metrics/feed-cache/')
+        self.assertEqual(
+            set(response.json()['index']),
+            {'size', 'max_size', 'hits', 'misses'})
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def test_card_is_cached_under_post_version(self):
+        post = Post.objects.feed().get(pk=self.post.pk)
+        render_cards([post])
+        self.assertIn('Тестовый пост', caches['default'].get(card_key(post)))
+        post.text = 'Изменённый пост'
+        post.save()
+        self.assertNotIn(
+            'Тестовый пост', caches['default'].get(card_key(post), ''))
+        card, = render_cards([post])
+        self.assertIn('Изменённый пост', card)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            file_cache = {
+                'default': {
+                    'BACKEND': (
+                        'django.core.cache.backends.filebased.FileBasedCache'),
+                    'LOCATION': location,
+                }
+            }
+            with override_settings(CACHES=file_cache):
+                post = Post.objects.feed().get(pk=self.post.pk)
+                render_cards([post])
+                self.assertIn(
+                    'Тестовый пост', caches['default'].get(card_key(post)))
@@ -0,0 +1,111 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.utils import timezone
+
+from ..models import Group, Post, PostTombstone
+
+
+User = get_user_model()
+
+
+class ChangesFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def sync(self, since=0, limit=2):
+        """Проходит ленту изменений до конца, как это делает клиент."""
+        changes = []
+        while True:
+            data = self.guest_client.get(
+                '/changes/', {'since': since, 'limit': limit}).json()
+            changes.extend(data['changes'])
+            since = data['next']
+            if not data['has_more']:
+                return changes, since
+
+    def test_created_edited_and_deleted_posts(self):
+        first = Post.objects.create(author=self.user, text='Первый')
+        second = Post.objects.create(author=self.user, text='Второй')
+        third = Post.objects.create(author=self.user, text='Третий')
+        changes, cursor = self.sync()
+        self.assertEqual(
+            [change['id'] for change in changes],
+            [first.pk, second.pk, third.pk])
+        first.text = 'Первый, исправленный'
+        first.save()
+        second_id = second.pk
+        second.delete()
+        changes, cursor = self.sync(cursor)
+        self.assertEqual(
+            [(change['type'], change['id']) for change in changes],
+            [('upsert', first.pk), ('delete', second_id)])
+        self.assertEqual(
+            changes[0]['post']['text'], 'Первый, исправленный')
+        self.assertEqual(self.sync(cursor)[0], [])
+
+    def test_author_rename_resends_posts(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        _, cursor = self.sync()
+        self.user.username = 'renamed'
+        self.user.save()
+        changes, cursor = self.sync(cursor)
+        self.assertEqual([change['id'] for change in changes], [post.pk])
+        self.assertEqual(changes[0]['post']['author'], 'renamed')
+
+    def test_group_slug_change_resends_posts(self):
+        group = Group.objects.create(
+            title='Группа', slug='old-slug', description='Описание')
+        post = Post.objects.create(author=self.user, group=group, text='Пост')
+        _, cursor = self.sync()
+        group = Group.objects.get(pk=group.pk)
+        group.slug = 'new-slug'
+        group.save()
+        changes, cursor = self.sync(cursor)
+        self.assertEqual([change['id'] for change in changes], [post.pk])
+        self.assertEqual(changes[0]['post']['group'], 'new-slug')
+        group.title = 'Новое название'
+        group.save()
+        self.assertEqual(self.sync(cursor)[0], [])
+
+    def test_group_delete_resends_posts(self):
+        group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        posts = [
+            Post.objects.create(author=self.user, group=group, text=text)
+            for text in ('Первый', 'Второй')]
+        Post.objects.create(author=self.user, text='Без группы')
+        _, cursor = self.sync()
+        group.delete()
+        changes, cursor = self.sync(cursor)
+        self.assertEqual(
+            [change['id'] for change in changes],
+            [post.pk for post in posts])
+        self.assertEqual(
+            [change['post']['group'] for change in changes], [None, None])
+
+    def test_bad_parameters(self):
+        response = self.guest_client.get('/changes/', {'since': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_pruned_tombstones_require_resync(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        since = post.revision
+        post.delete()
+        PostTombstone.objects.update(
+            deleted_at=timezone.now() - datetime.timedelta(days=100))
+        Post.objects.create(author=self.user, text='Новый пост')
+        call_command('prune_tombstones', days=90, stdout=StringIO())
+        self.assertFalse(PostTombstone.objects.exists())
+        response = self.guest_client.get('/changes/', {'since': since})
+        self.assertEqual(response.status_code, 410)
+        response = self.guest_client.get('/changes/', {'since': 0})
+        self.assertEqual(len(response.json()['changes']), 1)
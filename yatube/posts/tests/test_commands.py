@@ -0,0 +1,166 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..counters import post_count
+from ..models import Post, PostCounter, Group, Sequence
+
+
+User = get_user_model()
+
+
+class ImportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        return path
+
+    def test_import_jsonl(self):
+        records = [
+            {'text': 'Первый', 'author': 'auth', 'group': 'test-slug',
+             'pub_date': '2020-01-01T10:00:00+00:00'},
+            {'text': 'Второй', 'author': 'auth'},
+            {'text': 'Без автора', 'author': 'nobody'},
+        ]
+        path = self.write(
+            'posts.jsonl', '\n'.join(json.dumps(r) for r in records))
+        call_command('import_posts', path, batch_size=2, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        first = Post.objects.get(text='Первый')
+        self.assertEqual(first.group, self.group)
+        self.assertEqual(first.pub_date.year, 2020)
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.group.pk), 1)
+        revisions = sorted(Post.objects.values_list('revision', flat=True))
+        self.assertEqual(revisions[1], revisions[0] + 1)
+        self.assertGreater(revisions[0], self.group.revision)
+
+    def test_import_more_rows_than_default_batch(self):
+        """Пачка по умолчанию больше лимита SQLite на одну вставку."""
+        path = self.write('posts.jsonl', '\n'.join(
+            json.dumps({'text': f'Пост {i}', 'author': 'auth'})
+            for i in range(1500)))
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 1500)
+
+    def test_import_csv_resumes_from_checkpoint(self):
+        path = self.write(
+            'posts.csv',
+            'text,author,group\nПервый,auth,\nВторой,auth,test-slug\n')
+        Sequence.objects.create(name='import_posts:feed', value=1)
+        call_command(
+            'import_posts', path, checkpoint='feed', resume=True,
+            stdout=StringIO())
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Второй'])
+        self.assertEqual(
+            Sequence.objects.get(name='import_posts:feed').value, 2)
+
+    def test_checkpoint_commits_with_batch(self):
+        """Сбой записи позиции откатывает и пачку: повтора не будет."""
+        path = self.write('posts.jsonl', '\n'.join(
+            json.dumps({'text': f'Пост {i}', 'author': 'auth'})
+            for i in range(4)))
+        update_or_create = Sequence.objects.update_or_create
+        calls = []
+
+        def fail_second_checkpoint(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            return update_or_create(*args, **kwargs)
+
+        with mock.patch.object(
+                Sequence.objects, 'update_or_create',
+                fail_second_checkpoint):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', path, batch_size=2, checkpoint='feed',
+                    stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        call_command(
+            'import_posts', path, batch_size=2, checkpoint='feed',
+            resume=True, stdout=StringIO())
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Пост 0', 'Пост 1', 'Пост 2', 'Пост 3'])
+        self.assertEqual(
+            Sequence.objects.get(name='import_posts:feed').value, 4)
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.admin = User.objects.create(username='admin', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        Post.objects.create(author=cls.user, group=cls.group, text='Первый')
+        Post.objects.create(author=cls.user, text='Второй')
+
+    def test_export_jsonl_in_batches(self):
+        out = StringIO()
+        call_command('export_posts', batch_size=1, stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [(row['text'], row['author'], row['group']) for row in rows],
+            [('Первый', 'auth', 'test-slug'), ('Второй', 'auth', None)])
+
+    def test_export_csv_gzip_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'posts.csv.gz')
+            call_command(
+                'export_posts', format='csv', gzip=True, output=path)
+            with gzip.open(path, 'rt', encoding='utf-8') as stream:
+                rows = list(csv.DictReader(stream))
+        self.assertEqual([row['text'] for row in rows], ['Первый', 'Второй'])
+
+    def test_streaming_view_for_staff_only(self):
+        response = self.client.get('/export/posts/')
+        self.assertEqual(response.status_code, 302)
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            '/export/posts/', {'format': 'csv', 'gzip': '1'})
+        self.assertTrue(response.streaming)
+        content = gzip.decompress(b''.join(response.streaming_content))
+        self.assertIn('Второй', content.decode())
+
+
+class WalkChangesTest(TestCase):
+    def test_walks_changes_in_batches(self):
+        user = User.objects.create(username='auth')
+        posts = [
+            Post.objects.create(author=user, text=f'Пост {i}')
+            for i in range(3)]
+        out = StringIO()
+        call_command(
+            'walk_changes', since=posts[0].revision, batch_size=1,
+            stdout=out, stderr=StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [row['id'] for row in rows], [posts[1].pk, posts[2].pk])
@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, Client
+
+from ..counters import post_count
+from ..models import Post, PostCounter, Group
+
+
+User = get_user_model()
+
+
+class PostCounterTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        cls.other_group = Group.objects.create(
+            title='Other group',
+            slug='other-slug',
+            description='Test description')
+        Post.objects.bulk_create([
+            Post(author=cls.user, group=cls.group, text=f'Пост {i}')
+            for i in range(3)])
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_missing_counter_is_computed_once(self):
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_AUTHOR, self.user.pk), 3)
+        with self.assertNumQueries(1):
+            post_count(PostCounter.SCOPE_AUTHOR, self.user.pk)
+
+    def test_signals_keep_counters_current(self):
+        scopes = (
+            (PostCounter.SCOPE_ALL, 0),
+            (PostCounter.SCOPE_AUTHOR, self.user.pk),
+            (PostCounter.SCOPE_GROUP, self.group.pk),
+            (PostCounter.SCOPE_GROUP, self.other_group.pk),
+        )
+        for scope, object_id in scopes:
+            post_count(scope, object_id)
+        post = Post.objects.create(
+            author=self.user, group=self.group, text='Новый пост')
+        self.assertEqual(post_count(PostCounter.SCOPE_ALL), 4)
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.group.pk), 4)
+        post = Post.objects.get(pk=post.pk)
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.group.pk), 3)
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.other_group.pk), 1)
+        post.delete()
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_AUTHOR, self.user.pk), 3)
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.other_group.pk), 0)
+
+    def test_stale_counter_does_not_block_delete(self):
+        """Отставший счётчик не мешает удалить пост и автора."""
+        author = User.objects.create(username='stale')
+        post_count(PostCounter.SCOPE_AUTHOR, author.pk)
+        Post.objects.bulk_create([Post(author=author, text='Мимо сигналов')])
+        Post.objects.get(author=author).delete()
+        self.assertEqual(post_count(PostCounter.SCOPE_AUTHOR, author.pk), 0)
+        Post.objects.bulk_create([Post(author=author, text='Ещё пост')])
+        author.delete()
+        self.assertFalse(Post.objects.filter(text='Ещё пост').exists())
+
+    def test_profile_reads_counter(self):
+        PostCounter.objects.create(
+            scope=PostCounter.SCOPE_AUTHOR, object_id=self.user.pk, count=42)
+        response = self.guest_client.get(f'/profile/{self.user.username}/')
+        self.assertEqual(response.context['count'], 42)
+        self.assertEqual(response.context['page_obj'].paginator.count, 42)
+
+    def test_rebuild_command(self):
+        PostCounter.objects.create(
+            scope=PostCounter.SCOPE_GROUP, object_id=self.group.pk, count=7)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_GROUP, self.group.pk), 3)
+        self.assertEqual(
+            post_count(PostCounter.SCOPE_AUTHOR, self.user.pk), 3)
@@ -1,7 +1,11 @@
+import datetime
+import threading
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
 
-from ..models import Group, Post
+from ..models import Group, Post, keep_pub_date
 
 User = get_user_model()
 
@@ -48,3 +52,54 @@ class PostModelTest(TestCase):
         }
         for field, value in dict_match.items():
             self.assertEqual(field, value)
+
+
+class RevisionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_revision_grows_on_every_save(self):
+        group = Group.objects.create(title='Группа', slug='group')
+        post = Post.objects.create(author=self.user, text='Пост', group=group)
+        self.assertGreater(post.revision, group.revision)
+        created_revision, created_at = post.revision, post.updated_at
+        post.text = 'Правка'
+        post.save()
+        self.assertGreater(post.revision, created_revision)
+        self.assertGreater(post.updated_at, created_at)
+
+    def test_changed_since(self):
+        first = Post.objects.create(author=self.user, text='Первый')
+        second = Post.objects.create(author=self.user, text='Второй')
+        first.save()
+        self.assertEqual(
+            list(Post.objects.changed_since(first.revision - 1)), [first])
+        self.assertEqual(
+            list(Post.objects.changed_since(second.revision - 1)),
+            [second, first])
+
+
+class KeepPubDateTest(SimpleTestCase):
+    def setUp(self):
+        self.field = Post._meta.get_field('pub_date')
+        self.date = timezone.now() - datetime.timedelta(days=365)
+
+    def test_explicit_date_kept_only_inside_block(self):
+        with keep_pub_date():
+            self.assertEqual(
+                self.field.pre_save(Post(pub_date=self.date), True),
+                self.date)
+            self.assertIsNotNone(self.field.pre_save(Post(), True))
+        self.assertGreater(
+            self.field.pre_save(Post(pub_date=self.date), True), self.date)
+
+    def test_other_threads_keep_auto_now_add(self):
+        dates = []
+        with keep_pub_date():
+            thread = threading.Thread(target=lambda: dates.append(
+                self.field.pre_save(Post(pub_date=self.date), True)))
+            thread.start()
+            thread.join()
+        self.assertGreater(dates[0], self.date)
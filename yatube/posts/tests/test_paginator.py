@@ -0,0 +1,119 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.paginator import Page, Paginator
+
+from ..models import Post, Group
+from ..paginator import CountedPaginator, KeysetPaginator, page_window
+
+
+User = get_user_model()
+
+
+@override_settings(POSTS_PAGINATION_MODE='keyset')
+class KeysetPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Anonimus')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        BATCH_SIZE = 13
+        cls.posts = Post.objects.bulk_create([Post(
+            text=f'Тестовый пост {i}',
+            author=cls.user,
+            group=cls.group) for i in range(BATCH_SIZE)])
+        cls.ordered = list(
+            Post.objects.order_by(*KeysetPaginator.ordering))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_page_is_compatible(self):
+        page_obj = KeysetPaginator(Post.objects.all(), 10).get_page(None)
+        self.assertIsInstance(page_obj, Page)
+        self.assertIsInstance(page_obj.paginator, Paginator)
+        self.assertEqual(list(page_obj), self.ordered[:10])
+        self.assertTrue(page_obj.has_next())
+        self.assertFalse(page_obj.has_previous())
+
+    def test_next_and_previous_cursor(self):
+        paginator = KeysetPaginator(Post.objects.all(), 10)
+        first = paginator.get_page(None)
+        second = paginator.get_page(first.next_cursor)
+        self.assertEqual(list(second), self.ordered[10:])
+        self.assertFalse(second.has_next())
+        back = paginator.get_page(second.previous_cursor)
+        self.assertEqual(list(back), self.ordered[:10])
+        self.assertFalse(back.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        page_obj = KeysetPaginator(Post.objects.all(), 10).get_page('junk')
+        self.assertEqual(list(page_obj), self.ordered[:10])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+    def test_cursor_queries_are_index_ranges(self):
+        """Курсор задаёт диапазон индекса, а не обход с начала ленты."""
+        paginator = KeysetPaginator(Post.objects.feed(), 10)
+        post = self.ordered[5]
+        queries = {
+            'after': (paginator._after(post.pub_date, post.pk), '<'),
+            'before': (paginator._before(post.pub_date, post.pk), '>'),
+        }
+        for name, (queryset, sign) in queries.items():
+            with self.subTest(direction=name):
+                sql, params = queryset[:11].query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                    plan = [row[-1] for row in cursor.fetchall()]
+                self.assertIn(
+                    'SEARCH posts_post USING INDEX post_pub_date_id_idx '
+                    f'(pub_date{sign}?)', plan)
+
+    def test_feeds_use_cursor_links(self):
+        addresses = (
+            '/',
+            f'/group/{self.group.slug}/',
+            f'/profile/{self.user.username}/',
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                page_obj = response.context['page_obj']
+                self.assertEqual(len(page_obj), 10)
+                self.assertContains(
+                    response, f'?cursor={page_obj.next_cursor}')
+                response = self.guest_client.get(
+                    address, {'cursor': page_obj.next_cursor})
+                self.assertEqual(len(response.context['page_obj']), 3)
+
+
+class PageWindowTest(TestCase):
+    def window(self, number, num_pages):
+        paginator = CountedPaginator([], 10, count=num_pages * 10)
+        return page_window(paginator.page(number))
+
+    def test_small_paginator_shows_all_pages(self):
+        self.assertEqual(self.window(3, 6), [1, 2, 3, 4, 5, 6])
+
+    def test_window_around_current_page(self):
+        self.assertEqual(self.window(1, 10000), [1, 2, 3, None, 10000])
+        self.assertEqual(
+            self.window(5000, 10000),
+            [1, None, 4998, 4999, 5000, 5001, 5002, None, 10000])
+        self.assertEqual(
+            self.window(10000, 10000), [1, None, 9998, 9999, 10000])
+
+    def test_template_renders_window(self):
+        user = User.objects.create(username='Anonimus')
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=user) for i in range(100)])
+        response = Client().get('/', {'page': 5})
+        self.assertContains(response, 'href="?page=10"')
+        self.assertNotContains(response, 'href="?page=8"')
+        self.assertContains(response, '&hellip;', count=2)
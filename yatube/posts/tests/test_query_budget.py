@@ -0,0 +1,137 @@
+import difflib
+import json
+import os
+import re
+from importlib import import_module
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Post, Group
+
+
+User = get_user_model()
+
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), 'query_budget.json')
+URLCONFS = ('posts.urls', 'users.urls')
+# GET-параметры, без которых view не доходит до базы.
+EXTRA_QUERY = {
+    'posts:search': '?q=пост',
+    'posts:changes': '?since=0',
+}
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'IN \(\?(?:, \?)*\)')
+
+
+def normalize(sql):
+    """SQL без значений параметров: одинаков при любом объёме данных."""
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+@override_settings(POSTS_INDEX_CACHE_SIZE=0)
+class QueryBudgetTest(TestCase):
+    """Число запросов каждого адреса не растёт вместе с данными.
+
+    Обходит все маршруты `posts.urls` и `users.urls` на малом и
+    большом наборе данных и сверяет число запросов с бюджетом в
+    `query_budget.json`. Обновить бюджет:
+    `UPDATE_QUERY_BUDGET=1 python manage.py test posts.tests.test_query_budget`
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='auth', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Тестовый пост')
+        cls.url_kwargs = {
+            'slug': cls.group.slug,
+            'username': cls.user.username,
+            'post_id': cls.post.pk,
+        }
+
+    def routes(self):
+        for module in URLCONFS:
+            urlconf = import_module(module)
+            for pattern in urlconf.urlpatterns:
+                name = f'{urlconf.app_name}:{pattern.name}'
+                kwargs = {
+                    key: self.url_kwargs[key]
+                    for key in pattern.pattern.converters}
+                url = reverse(name, kwargs=kwargs)
+                yield name, url + EXTRA_QUERY.get(name, '')
+
+    def grow(self, total=40):
+        for i in range(total):
+            author = User.objects.create(username=f'author-{i}')
+            group = Group.objects.create(
+                title=f'Group {i}', slug=f'group-{i}', description='-')
+            Post.objects.create(
+                author=self.user if i % 2 else author,
+                group=self.group if i % 2 else group,
+                text=f'Тестовый пост {i}')
+
+    def capture(self, url):
+        client = Client()
+        client.force_login(self.user)
+        # Первый запрос заводит счётчики постов и кэш карточек.
+        client.get(url)
+        client.force_login(self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return [normalize(query['sql']) for query in context.captured_queries]
+
+    def capture_all(self):
+        return {name: self.capture(url) for name, url in self.routes()}
+
+    def load_budget(self):
+        with open(BUDGET_PATH, encoding='utf-8') as stream:
+            return json.load(stream)
+
+    def save_budget(self, queries):
+        budget = {
+            name: {'queries': len(sql), 'sql': sql}
+            for name, sql in sorted(queries.items())}
+        with open(BUDGET_PATH, 'w', encoding='utf-8') as stream:
+            json.dump(budget, stream, indent=2, ensure_ascii=False)
+            stream.write('\n')
+
+    def diff(self, expected, actual, expected_name, actual_name):
+        return '\n'.join(difflib.unified_diff(
+            expected, actual, expected_name, actual_name, lineterm=''))
+
+    def test_query_counts_within_budget(self):
+        small = self.capture_all()
+        self.grow()
+        large = self.capture_all()
+        if os.environ.get('UPDATE_QUERY_BUDGET'):
+            self.save_budget(large)
+        budget = self.load_budget()
+        failures = []
+        for name, sql in large.items():
+            if len(sql) != len(small[name]):
+                failures.append(
+                    f'{name}: {len(small[name])} запросов на малых данных, '
+                    f'{len(sql)} на больших\n'
+                    + self.diff(small[name], sql, 'малые', 'большие'))
+            if name not in budget:
+                failures.append(f'{name}: нет в {BUDGET_PATH}')
+            elif len(sql) > budget[name]['queries']:
+                failures.append(
+                    f'{name}: {len(sql)} запросов при бюджете '
+                    f'{budget[name]["queries"]}\n'
+                    + self.diff(budget[name]['sql'], sql, 'бюджет', name))
+        if failures:
+            self.fail('\n\n'.join(failures))
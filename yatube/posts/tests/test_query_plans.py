@@ -0,0 +1,57 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Post
+from ..paginator import KeysetPaginator
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class FeedQueryPlanTest(TestCase):
+    """Запросы лент идут по индексам, без полного скана и сортировки."""
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def feeds(self):
+        return {
+            'index': Post.objects.feed(),
+            'group': Post.objects.filter(group_id=1).feed(),
+            'profile': Post.objects.filter(author_id=1).feed(),
+        }
+
+    def assertIndexed(self, queryset, scan_allowed=False):
+        plan = self.explain(queryset)
+        for step in plan:
+            self.assertNotIn('TEMP B-TREE', step, plan)
+            if scan_allowed:
+                self.assertNotRegex(
+                    step, r'^SCAN (TABLE )?posts_post$', plan)
+            else:
+                self.assertNotRegex(
+                    step, r'^SCAN (TABLE )?posts_post\b', plan)
+
+    def test_offset_queries_use_indexes(self):
+        for name, feed in self.feeds().items():
+            with self.subTest(feed=name):
+                # Полная лента читает индекс по порядку - это SCAN по
+                # индексу, а отфильтрованная должна искать по нему.
+                self.assertIndexed(
+                    feed[:10], scan_allowed=name == 'index')
+
+    def test_keyset_queries_are_index_ranges(self):
+        now = timezone.now()
+        for name, feed in self.feeds().items():
+            paginator = KeysetPaginator(feed, 10)
+            queries = {
+                'after': paginator._after(now, 1),
+                'before': paginator._before(now, 1),
+            }
+            for direction, queryset in queries.items():
+                with self.subTest(feed=name, direction=direction):
+                    self.assertIndexed(queryset[:paginator.per_page + 1])
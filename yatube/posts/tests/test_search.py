@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+
+from ..models import Post
+from ..search import SearchResults, build_match
+
+
+User = get_user_model()
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Сегодня шёл дождь, дождь и снова дождь')
+        Post.objects.create(author=cls.user, text='Солнечный день и дождь')
+        Post.objects.bulk_create([
+            Post(author=cls.user, text=f'Пост без осадков {i}')
+            for i in range(12)])
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_build_match_escapes_operators(self):
+        self.assertEqual(build_match('кот OR "пёс'), '"кот"* "OR"* "пёс"*')
+        self.assertEqual(build_match('  -*  '), '')
+
+    def test_results_are_ranked(self):
+        results = SearchResults('дождь')
+        self.assertEqual(results.count(), 2)
+        self.assertEqual(results[0], self.post)
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Град'
+        post.save()
+        self.assertEqual(SearchResults('дождь').count(), 1)
+        self.assertEqual(SearchResults('град').count(), 1)
+        post.delete()
+        self.assertEqual(SearchResults('град').count(), 0)
+
+    def test_search_view_is_paginated(self):
+        response = self.guest_client.get('/search/', {'q': 'осадков'})
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.paginator.count, 12)
+        self.assertEqual(len(page_obj), 10)
+        self.assertContains(response, 'href="?q=%D0%BE%D1%81%D0%B0%D0%B4')
+        response = self.guest_client.get(
+            '/search/', {'q': 'осадков', 'page': 2})
+        self.assertEqual(len(response.context['page_obj']), 2)
+
+    def test_empty_query(self):
+        response = self.guest_client.get('/search/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['page_obj']), 0)
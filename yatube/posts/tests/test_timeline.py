@@ -0,0 +1,126 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..cache import index_page_cache
+from ..models import Post, reserve_revisions
+from ..timeline import TIMELINE_KEY, timeline
+
+
+User = get_user_model()
+
+
+def create_posts(user):
+    start = timezone.now() - datetime.timedelta(days=1)
+    posts = [
+        Post.objects.create(author=user, text=f'Пост {number}')
+        for number in range(20)]
+    for number, post in enumerate(posts):
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=start + datetime.timedelta(minutes=number))
+    return posts
+
+
+@override_settings(POSTS_TIMELINE_SIZE=15, POSTS_INDEX_CACHE_SIZE=0)
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='auth')
+        cls.posts = create_posts(cls.user)
+
+    def setUp(self):
+        timeline.reset()
+        index_page_cache.clear()
+        self.guest_client = Client()
+
+    def tearDown(self):
+        timeline.reset()
+
+    def timeline_ids(self):
+        return [pk for _, pk in timeline.state()['entries']]
+
+    def test_buffer_holds_newest_ids(self):
+        expected = [post.pk for post in reversed(self.posts)][:15]
+        self.assertEqual(self.timeline_ids(), expected)
+        self.assertFalse(timeline.state()['complete'])
+
+    def test_first_page_fetched_by_ids(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.guest_client.get('/')
+        expected = list(reversed(self.posts))[:10]
+        self.assertEqual(list(response.context['page_obj']), expected)
+        feed_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "posts_post" INNER JOIN' in query['sql']]
+        self.assertEqual(len(feed_queries), 1)
+        self.assertIn('"posts_post"."id" IN (', feed_queries[0])
+
+    def test_page_past_buffer_falls_back(self):
+        response = self.guest_client.get('/', {'page': 2})
+        expected = list(reversed(self.posts))[10:]
+        self.assertEqual(list(response.context['page_obj']), expected)
+
+    def test_write_from_other_process_rebuilds_buffer(self):
+        timeline.state()
+        # Другой воркер: пост вставлен мимо сигналов этого процесса.
+        last = reserve_revisions()
+        Post.objects.bulk_create([Post(
+            author=self.user, text='Чужой пост', revision=last)])
+        new_post = Post.objects.get(text='Чужой пост')
+        self.assertEqual(self.timeline_ids()[0], new_post.pk)
+
+    @override_settings(POSTS_TIMELINE_SIZE=0)
+    def test_disabled_by_size(self):
+        self.assertIsNone(timeline.state())
+        response = self.guest_client.get('/')
+        self.assertEqual(len(response.context['page_obj']), 10)
+
+
+@override_settings(POSTS_TIMELINE_SIZE=15)
+class TimelineHooksTest(TransactionTestCase):
+    """Сигналы меняют буфер только после фиксации транзакции."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='auth')
+        self.posts = create_posts(self.user)
+        timeline.reset()
+        self.addCleanup(timeline.reset)
+
+    def timeline_ids(self):
+        return [pk for _, pk in timeline.state()['entries']]
+
+    def test_hooks_keep_buffer_current(self):
+        timeline.state()
+        new_post = Post.objects.create(author=self.user, text='Новый пост')
+        self.assertEqual(self.timeline_ids()[0], new_post.pk)
+        self.assertEqual(len(self.timeline_ids()), 15)
+        deleted_id = self.posts[-1].pk
+        self.posts[-1].delete()
+        self.assertNotIn(deleted_id, self.timeline_ids())
+        old_post = Post.objects.create(author=self.user, text='Старый пост')
+        old_post.pub_date = timezone.now() - datetime.timedelta(days=30)
+        old_post.save()
+        self.assertNotIn(old_post.pk, self.timeline_ids())
+
+    def test_saved_post_extends_buffer_in_place(self):
+        timeline.state()
+        new_post = Post.objects.create(author=self.user, text='Новый пост')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.timeline_ids()[0], new_post.pk)
+
+    def test_rolled_back_post_stays_out_of_buffer(self):
+        timeline.state()
+        cached = timeline.cache.get(TIMELINE_KEY)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                Post.objects.create(author=self.user, text='Откатится')
+                raise RuntimeError('откат')
+        self.assertEqual(timeline.cache.get(TIMELINE_KEY), cached)
+        new_post = Post.objects.create(author=self.user, text='Новый пост')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.timeline_ids()[0], new_post.pk)
@@ -1,7 +1,9 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django import forms
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from ..models import Post, Group
 from ..forms import PostForm
@@ -162,3 +164,129 @@ class PaginatorTest(TestCase):
                 response = self.guest_client.get(address, num)
                 len_page = len(response.context['page_obj'])
                 self.assertEqual(len_page, qnt)
+
+
+@override_settings(POSTS_INDEX_CACHE_SIZE=0)
+class FeedQueryCountTest(TestCase):
+    """Число запросов на страницу ленты не зависит от числа постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        cls.user = User.objects.create(username='Anonimus')
+        cls.addresses = (
+            '/',
+            f'/group/{cls.group.slug}/',
+            f'/profile/{cls.user.username}/',
+        )
+
+    def create_posts(self, start, stop):
+        for i in range(start, stop):
+            author = User.objects.create(username=f'author-{i}')
+            group = Group.objects.create(
+                title=f'Group {i}', slug=f'group-{i}', description='-')
+            Post.objects.create(
+                author=self.user if i % 2 else author,
+                group=self.group if i % 2 else group,
+                text=f'Тестовый пост {i}')
+
+    def count_queries(self, address):
+        with CaptureQueriesContext(connection) as context:
+            self.guest_client.get(address)
+        return len(context)
+
+    def test_feed_query_count_is_constant(self):
+        self.create_posts(0, 2)
+        for address in self.addresses:
+            # Первый запрос заводит счётчики постов.
+            self.guest_client.get(address)
+        baseline = {
+            address: self.count_queries(address)
+            for address in self.addresses}
+        self.create_posts(2, 20)
+        for address, expected in baseline.items():
+            with self.subTest(address=address):
+                self.assertEqual(self.count_queries(address), expected)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='auth')
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug='test-slug',
+            description='Test description')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group)
+        cls.addresses = (
+            '/',
+            f'/group/{cls.group.slug}/',
+            f'/profile/{cls.user.username}/',
+            f'/posts/{cls.post.id}/',
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_not_modified(self):
+        for address in self.addresses:
+            with self.subTest(address=address):
+                etag = self.guest_client.get(address)['ETag']
+                response = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etags = {
+            address: self.guest_client.get(address)['ETag']
+            for address in self.addresses}
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Изменённый пост'
+        post.save()
+        for address, etag in etags.items():
+            with self.subTest(address=address):
+                response = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_author_rename_changes_etag(self):
+        etags = {
+            address: self.guest_client.get(address)['ETag']
+            for address in self.addresses}
+        self.user.first_name = 'Лев'
+        self.user.save()
+        for address, etag in etags.items():
+            with self.subTest(address=address):
+                response = self.guest_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_group_delete_changes_etag(self):
+        address = f'/group/{self.group.slug}/'
+        etag = self.guest_client.get(address)['ETag']
+        Group.objects.filter(pk=self.group.pk).delete()
+        response = self.guest_client.get(address, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_check_is_one_query(self):
+        etag = self.guest_client.get('/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.guest_client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_user_and_page(self):
+        etag = self.guest_client.get('/')['ETag']
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        response = authorized_client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        response = self.guest_client.get(
+            '/', {'page': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,122 @@
+import bisect
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Post, current_revision
+
+TIMELINE_KEY = 'posts:timeline'
+
+
+class Timeline:
+    """Материализованная лента главной: id новейших постов по порядку.
+
+    Хранит в кэше `POSTS_CARD_CACHE` до `POSTS_TIMELINE_SIZE` пар
+    (время публикации, id) в порядке (-pub_date, id) вместе с ревизией
+    базы, на которой буфер верен. Читатель сверяет её с текущей и при
+    расхождении пересобирает буфер одним запросом по индексу
+    `post_pub_date_id_idx`. Так правки из других воркеров и общий кэш
+    с гонкой записей не дают устаревшей ленты. Сигнал сохранения
+    поста дописывает буфер сам, если до поста база не менялась.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return settings.POSTS_TIMELINE_SIZE
+
+    @property
+    def cache(self):
+        return caches[settings.POSTS_CARD_CACHE]
+
+    def _build(self, revision):
+        rows = Post.objects.order_by('-pub_date', 'id').values_list(
+            'pub_date', 'id')[:self.size + 1]
+        entries = [(-pub_date.timestamp(), pk) for pub_date, pk in rows]
+        return {
+            'entries': entries[:self.size],
+            'complete': len(entries) <= self.size,
+            'revision': revision,
+        }
+
+    def state(self):
+        """Буфер ленты или `None`, если лента выключена."""
+        if self.size <= 0:
+            return None
+        # Ревизия читается до постов: запись между ними даст буфер со
+        # старой ревизией, и следующий читатель его пересоберёт.
+        revision = current_revision()
+        state = self.cache.get(TIMELINE_KEY)
+        if state is None or state.get('revision') != revision:
+            state = self._build(revision)
+            self.cache.set(TIMELINE_KEY, state, None)
+        return state
+
+    def add(self, post):
+        if self.size <= 0:
+            return
+        entry = (-post.pub_date.timestamp(), post.pk)
+        with self._lock:
+            state = self.cache.get(TIMELINE_KEY)
+            if state is None:
+                return
+            if state.get('revision') != post.revision - 1:
+                # Между буфером и постом были другие записи.
+                self.cache.delete(TIMELINE_KEY)
+                return
+            entries = [item for item in state['entries'] if item[1] != post.pk]
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) or state['complete']:
+                entries.insert(position, entry)
+            if len(entries) > self.size:
+                entries = entries[:self.size]
+                state['complete'] = False
+            state['entries'] = entries
+            state['revision'] = post.revision
+            self.cache.set(TIMELINE_KEY, state, None)
+
+    def remove(self, post_id):
+        if self.size <= 0:
+            return
+        # Удаление сдвигает ревизию следом удаления, буфер пересоберётся.
+        self.cache.delete(TIMELINE_KEY)
+
+    def reset(self):
+        """Сбрасывает буфер: после массовых вставок мимо сигналов."""
+        self.cache.delete(TIMELINE_KEY)
+
+
+timeline = Timeline()
+
+
+class TimelinePosts:
+    """Лента главной для `Paginator` поверх буфера `Timeline`.
+
+    Срез, целиком лежащий в буфере, забирается одним запросом
+    `id__in`; всё дальше буфера берётся из обычного `queryset`.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.state = timeline.state()
+
+    def count(self):
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        state = self.state
+        if state is None or (
+                item.stop > len(state['entries'])
+                and not state['complete']):
+            return list(self.queryset[item])
+        ids = [pk for _, pk in state['entries'][item]]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
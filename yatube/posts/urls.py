@@ -9,6 +9,11 @@ urlpatterns = [
     path('group/<slug:slug>/', views.group_post, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('search/', views.search, name='search'),
+    path('changes/', views.changes, name='changes'),
     path('create/', views.post_create, name='post_create'),
-    path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit')
+    path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path('metrics/feed-cache/', views.feed_cache_stats,
+         name='feed_cache_stats'),
+    path('export/posts/', views.export_posts_view, name='export_posts')
 ]
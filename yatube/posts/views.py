@@ -1,26 +1,82 @@
+import hashlib
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import condition
 
 from posts.forms import PostForm
-from .models import Post, Group, User
+from .cache import index_page_cache
+from .changes import changes_since, pruned_revision
+from .counters import post_count
+from .export import export_posts
+from .models import Post, PostCounter, Group, User, current_revision
+from .paginator import CountedPaginator, KeysetPaginator
+from .search import SearchResults
+from .timeline import TimelinePosts
 
 
 POSTS_PER_PAGE = 10
+CHANGES_PER_PAGE = 100
+CHANGES_MAX_PER_PAGE = 1000
+
 
+def get_paginator(request, page, num, mode=None, count=None):
+    """Возвращает страницу постов.
 
-def get_paginator(request, page, num):
-    paginator = Paginator(page, num)
+    Режим `keyset` листает по курсору `?cursor=`, режим `offset` -
+    по номеру страницы `?page=`. Переданный курсор всегда включает
+    курсорный режим, чтобы ссылки из него оставались рабочими.
+    Известное заранее `count` избавляет от лишнего `COUNT(*)`.
+    """
+    if is_keyset(request, mode):
+        return KeysetPaginator(page, num).get_page(request.GET.get('cursor'))
+    paginator = CountedPaginator(page, num, count=count)
     page_numder = request.GET.get('page')
     page_obj: Paginator = paginator.get_page(page_numder)
     return page_obj
 
 
+def is_keyset(request, mode=None):
+    mode = mode or settings.POSTS_PAGINATION_MODE
+    return mode == 'keyset' or bool(request.GET.get('cursor'))
+
+
+def make_etag(request, *parts):
+    """Хэш состояния страницы для условного GET.
+
+    В него входят пользователь и адрес запроса, так что разные
+    посетители и страницы не получают чужой `304`.
+    """
+    raw = repr((request.user.pk, request.get_full_path()) + parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def feed_etag(request, *args, **kwargs):
+    """ETag страниц с постами по одной строке счётчика ревизий.
+
+    Ревизию сдвигают правки и удаления постов и групп, удаление и
+    переименование пользователей, поэтому запросы самой страницы для
+    проверки не нужны.
+    """
+    return make_etag(request, current_revision())
+
+
+@condition(etag_func=feed_etag)
 def index(request):
     template = 'posts/index.html'
     title = 'Последние обновления на сайте'
-    posts = Post.objects.all()
-    page_obj = get_paginator(request, posts, POSTS_PER_PAGE)
+    posts = Post.objects.feed()
+    # Первые страницы по номеру берутся из материализованной ленты.
+    source = posts
+    if settings.POSTS_TIMELINE_SIZE > 0 and not is_keyset(request):
+        source = TimelinePosts(posts)
+    page_obj = get_paginator(
+        request, source, POSTS_PER_PAGE,
+        count=post_count(PostCounter.SCOPE_ALL))
     context = {
         'posts': posts,
         'page_obj': page_obj,
@@ -28,12 +84,15 @@ def index(request):
     return render(request, template, context)
 
 
+@condition(etag_func=feed_etag)
 def group_post(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    posts = group.groups.all()
+    posts = group.groups.feed()
     description = group.description
-    page_obj = get_paginator(request, posts, POSTS_PER_PAGE)
+    page_obj = get_paginator(
+        request, posts, POSTS_PER_PAGE,
+        count=post_count(PostCounter.SCOPE_GROUP, group.pk))
     title = f'Вы в сообществе {group}'
     context = {
         'description': description,
@@ -43,11 +102,12 @@ def group_post(request, slug):
     return render(request, template, context)
 
 
+@condition(etag_func=feed_etag)
 def profile(request, username):
     user = get_object_or_404(User, username=username)
-    posts = user.posts.all()
-    count = posts.count()
-    page_obj = get_paginator(request, posts, POSTS_PER_PAGE)
+    posts = user.posts.feed()
+    count = post_count(PostCounter.SCOPE_AUTHOR, user.pk)
+    page_obj = get_paginator(request, posts, POSTS_PER_PAGE, count=count)
     context = {
         'count': count,
         'page_obj': page_obj,
@@ -56,12 +116,25 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    results = SearchResults(query)
+    page_obj = CountedPaginator(
+        results, POSTS_PER_PAGE, count=results.count()
+    ).get_page(request.GET.get('page'))
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@condition(etag_func=feed_etag)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    author_posts = post.author.posts.all()
+    post = get_object_or_404(Post.objects.feed(), pk=post_id)
     author_name = post.author
     user = request.user
-    count = author_posts.count()
+    count = post_count(PostCounter.SCOPE_AUTHOR, post.author_id)
     context = {
         'author_name': author_name,
         'user': user,
@@ -95,3 +168,47 @@ def post_edit(request, post_id):
         return redirect('posts:post_detail', post_id=post_id)
     return render(request, 'posts/create_post.html',
                   {'form': form, 'post_id': post_id, 'is_edit': True})
+
+
+@staff_member_required
+def feed_cache_stats(request):
+    return JsonResponse({'index': index_page_cache.stats()})
+
+
+@staff_member_required
+def export_posts_view(request):
+    fmt = 'csv' if request.GET.get('format') == 'csv' else 'jsonl'
+    compress = request.GET.get('gzip') == '1'
+    filename = f'posts.{fmt}'
+    content_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    if compress:
+        filename += '.gz'
+        content_type = 'application/gzip'
+    response = StreamingHttpResponse(
+        export_posts(fmt, compress), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def changes(request):
+    """Лента изменений постов после ревизии `?since=`.
+
+    Курсор для следующего запроса - поле `next`. Если следы удалений
+    после `since` уже стёрты, отвечает `410`: клиенту нужна полная
+    синхронизация с `since=0`.
+    """
+    try:
+        since = int(request.GET.get('since', 0))
+        limit = int(request.GET.get('limit', CHANGES_PER_PAGE))
+    except ValueError:
+        return JsonResponse(
+            {'error': 'since и limit должны быть числами'}, status=400)
+    limit = max(1, min(limit, CHANGES_MAX_PER_PAGE))
+    if 0 < since < pruned_revision():
+        return JsonResponse({'error': 'resync'}, status=410)
+    page, has_more = changes_since(since, limit)
+    return JsonResponse({
+        'changes': page,
+        'next': page[-1]['revision'] if page else since,
+        'has_more': has_more,
+    })
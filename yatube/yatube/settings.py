@@ -1,5 +1,7 @@
 import os
 
+from core.hashers import password_hashers
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -24,11 +26,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
+    'core.middleware.ThrottleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -39,7 +44,8 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.InstrumentedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -57,15 +63,60 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Компилировать все шаблоны при старте WSGI (см. settings_production).
+TEMPLATES_WARM_UP = False
+
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+    },
+}
+
+# PRAGMA для каждого нового соединения SQLite (core.db.backends.sqlite3).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Открывать транзакции как BEGIN IMMEDIATE: писатели ждут друг друга
+# по busy_timeout вместо ошибки "database is locked".
+SQLITE_IMMEDIATE_TRANSACTIONS = True
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Алиасы реплик из DATABASES, на которые уходят чтения; пустой список -
+# всё в default. Реплики описываются в настройках окружения рядом с
+# настоящей репликацией.
+DATABASE_REPLICAS = []
+
+# Сколько секунд после записи сессия читает из основной базы.
+REPLICA_STICKY_SECONDS = 10
+
+
+# Для нескольких процессов без внешних сервисов подойдёт файловый кэш:
+# 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+# 'LOCATION': os.path.join(BASE_DIR, 'cache'),
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
     }
 }
 
 
+# Алгоритм хэширования паролей: 'pbkdf2', 'argon2', 'bcrypt' или 'fast'
+# (MD5, только для тестов, см. settings_test).
+# Хэши прочих алгоритмов принимаются и перехэшируются при входе.
+PASSWORD_HASH_POLICY = os.environ.get('PASSWORD_HASH_POLICY', 'pbkdf2')
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASH_POLICY)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -97,6 +148,37 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Режим пагинации лент: 'offset' (?page=) или 'keyset' (?cursor=).
+POSTS_PAGINATION_MODE = 'offset'
+
+# Сколько отрендеренных страниц главной держать в памяти, 0 - не кэшировать.
+POSTS_INDEX_CACHE_SIZE = 20
+
+# Кэш отрендеренных карточек постов и время их жизни в секундах.
+POSTS_CARD_CACHE = 'default'
+POSTS_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Сколько id новейших постов держать в материализованной ленте главной
+# (в кэше POSTS_CARD_CACHE), 0 - читать главную прямо из таблицы постов.
+POSTS_TIMELINE_SIZE = 0
+
+# Лимиты пишущих запросов: имя view -> (запросов, за секунд).
+THROTTLE_RATES = {
+    'posts:post_create': (10, 60),
+    'users:login': (10, 60),
+    'users:signup': (5, 60),
+}
+
+# Хранилище лимитов. Для нескольких воркеров - общий файл:
+# {'BACKEND': 'core.throttling.SQLiteStore',
+#  'LOCATION': os.path.join(BASE_DIR, 'throttle.sqlite3')}
+THROTTLE_STORE = {'BACKEND': 'core.throttling.MemoryStore'}
+
+# Отдавать стоимость запроса в заголовке Server-Timing. Заголовок
+# раскрывает внутреннее устройство, поэтому по умолчанию выключен:
+# SERVER_TIMING_HEADER=1 в окружении включает его.
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER') == '1'
+
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
@@ -0,0 +1,25 @@
+"""Настройки боевого запуска.
+
+DJANGO_SETTINGS_MODULE=yatube.settings_production
+
+Секретный ключ и имена хостов берутся из окружения:
+DJANGO_SECRET_KEY и DJANGO_ALLOWED_HOSTS (через запятую).
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+
+# Без DJANGO_SECRET_KEY ключ пуст, и Django откажется запускаться.
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', '')
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host.strip()]
+
+# При DEBUG = False Django сам оборачивает загрузчики шаблонов в
+# кэширующий: шаблоны читаются и разбираются один раз на процесс.
+DEBUG = False
+
+# Скомпилировать все шаблоны при старте WSGI-приложения.
+TEMPLATES_WARM_UP = True
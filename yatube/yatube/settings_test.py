@@ -0,0 +1,29 @@
+"""Настройки прогона тестов.
+
+`manage.py test` и pytest (см. pytest.ini) берут их по умолчанию.
+"""
+import os
+
+from core.hashers import password_hashers
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+# Стенды реплик для тестов роутера: отдельные базы без репликации,
+# поэтому по ним видно, куда ушло чтение.
+DATABASES = {
+    **DATABASES,
+    **{
+        alias: {
+            'ENGINE': 'core.db.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, f'db_{alias}.sqlite3'),
+            'TEST': {'NAME': os.path.join(BASE_DIR, f'test_{alias}.sqlite3')},
+        }
+        for alias in ('replica1', 'replica2')},
+}
+
+# MD5 вместо медленного алгоритма, чтобы create_user не съедал время
+# прогона. core.W001 предупреждает о нём во всех остальных настройках.
+PASSWORD_HASH_POLICY = 'fast'
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASH_POLICY)
+SILENCED_SYSTEM_CHECKS = ['core.W001']